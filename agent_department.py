@@ -3,11 +3,61 @@ Agent Department System
 部门管理系统 - 组织 Agent 的部门结构
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from datetime import datetime
+import atexit
+import heapq
+import itertools
 import json
+import logging
+import os
+import threading
+import time
+import warnings
+import weakref
+from functools import wraps
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # 未安装 ijson 时大文件也整体解析
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+
+# 旧版本把全部部门保存在这个单一文件中；storage_dir 为空时从这里迁移一次
+_LEGACY_STORAGE_FILE = "/Users/viosson/departments_config.json"
+
+# 超过该大小的部门文件用 ijson 流式加载，避免整份 JSON 常驻内存
+_STREAM_LOAD_THRESHOLD = 1 << 20  # 1MB
+# 部门文件中的顶层标量字段（流式加载时先单独读出，用于排序和构造 Department）
+_DEPT_HEADER_FIELDS = frozenset((
+    "id", "name", "type", "description",
+    "lead_agent_id", "lead_agent_name", "created_at", "updated_at"
+))
+
+
+# 时间戳缓存: 批量修改时复用同一 ISO 字符串，避免每次都格式化当前时间
+_NOW_CACHE_TTL = 0.1  # 秒
+_now_cache = ("", float("-inf"))
+
+
+def _now_iso() -> str:
+    """返回当前时间的 ISO 字符串（_NOW_CACHE_TTL 内复用）"""
+    global _now_cache
+    text, stamp = _now_cache
+    now = time.monotonic()
+    if now - stamp >= _NOW_CACHE_TTL:
+        text = datetime.now().isoformat()
+        _now_cache = (text, now)
+    return text
 
 
 class PositionLevel(Enum):
@@ -28,7 +78,12 @@ class DepartmentType(Enum):
     OPERATIONS = "operations"      # 运维部门
 
 
-@dataclass
+# 枚举值 -> 成员，加载配置时直接查表
+_POSITION_LEVEL_BY_VALUE: Dict[str, PositionLevel] = {e.value: e for e in PositionLevel}
+_DEPARTMENT_TYPE_BY_VALUE: Dict[str, DepartmentType] = {e.value: e for e in DepartmentType}
+
+
+@dataclass(slots=True)
 class Position:
     """职位定义"""
     name: str                       # "Senior Developer"
@@ -37,17 +92,30 @@ class Position:
     required_skills: List[str] = field(default_factory=list)  # 需要的技能
     max_agents: int = 5             # 最多可配置的 Agent 数量
     
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
+    # level 的字符串值，随 level 重新赋值而更新，输出时不必每次取 Enum.value
+    level_value: str = field(init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == "level":
+            object.__setattr__(self, "level_value", value.value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
+    
     def to_dict(self) -> Dict:
-        return {
-            "name": self.name,
-            "level": self.level.value,
-            "description": self.description,
-            "required_skills": self.required_skills,
-            "max_agents": self.max_agents
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "name": self.name,
+                "level": self.level_value,
+                "description": self.description,
+                "required_skills": self.required_skills,
+                "max_agents": self.max_agents
+            }
+        return self._dict_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentInPosition:
     """职位上的 Agent"""
     agent_id: str
@@ -59,20 +127,39 @@ class AgentInPosition:
     assigned_unit_id: Optional[str] = None  # 当前所属 Unit
     joined_at: str = field(default_factory=lambda: datetime.now().isoformat())
     
+    # to_dict_light() 结果缓存，任一字段被重新赋值时失效
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
+    # skills 的集合形式，技能匹配为 O(1)；随 skills 重新赋值而更新
+    skills_set: frozenset = field(init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == "skills":
+            object.__setattr__(self, "skills_set", frozenset(value))
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
+    
     def to_dict(self) -> Dict:
-        return {
-            "agent_id": self.agent_id,
-            "agent_name": self.agent_name,
-            "position": self.position.to_dict(),
-            "department_id": self.department_id,
-            "skills": self.skills,
-            "availability": self.availability,
-            "assigned_unit_id": self.assigned_unit_id,
-            "joined_at": self.joined_at
-        }
+        data = dict(self.to_dict_light())
+        data["position"] = self.position.to_dict()
+        return data
+    
+    def to_dict_light(self) -> Dict:
+        """不含职位定义的序列化结果（职位定义由所属部门统一保存）"""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "agent_id": self.agent_id,
+                "agent_name": self.agent_name,
+                "department_id": self.department_id,
+                "skills": self.skills,
+                "availability": self.availability,
+                "assigned_unit_id": self.assigned_unit_id,
+                "joined_at": self.joined_at
+            }
+        return self._dict_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class Department:
     """部门"""
     id: str
@@ -83,18 +170,27 @@ class Department:
     lead_agent_name: str            # 部长 Agent 名称
     
     # 组织结构
-    positions: Dict[str, List[AgentInPosition]] = field(default_factory=dict)
-    # positions 结构: {"Senior Developer": [agent1, agent2], ...}
+    positions: Dict[str, Dict[str, AgentInPosition]] = field(default_factory=dict)
+    # positions 结构: {"Senior Developer": {agent_id: agent, ...}, ...}，按加入顺序排列
+    position_defs: Dict[str, Position] = field(default_factory=dict)
+    # position_defs 结构: {"Senior Developer": Position(...)}，同一职位的 Agent 共享该对象
     
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    updated_at: str = field(default_factory=_now_iso)
+    
+    # 可用 / 已分配 Agent ID 集合，统计时无需遍历全部 Agent
+    _available_ids: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    _assigned_ids: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    # 职位名称元组缓存；职位只增不减，数量变化即说明缓存过期
+    _position_names: Tuple[str, ...] = field(default=(), init=False, repr=False, compare=False)
     
     def add_position(self, position: Position) -> bool:
         """添加职位"""
         if position.name in self.positions:
             return False
-        self.positions[position.name] = []
-        self.updated_at = datetime.now().isoformat()
+        self.positions[position.name] = {}
+        self.position_defs[position.name] = position
+        self.updated_at = _now_iso()
         return True
     
     def add_agent_to_position(self, agent: AgentInPosition) -> bool:
@@ -106,8 +202,9 @@ class Department:
         if len(self.positions[position_name]) >= agent.position.max_agents:
             return False
         
-        self.positions[position_name].append(agent)
-        self.updated_at = datetime.now().isoformat()
+        self.positions[position_name][agent.agent_id] = agent
+        self._track_agent(agent)
+        self.updated_at = _now_iso()
         return True
     
     def remove_agent_from_position(self, agent_id: str, position_name: str) -> bool:
@@ -115,33 +212,70 @@ class Department:
         if position_name not in self.positions:
             return False
         
-        self.positions[position_name] = [
-            a for a in self.positions[position_name] 
-            if a.agent_id != agent_id
-        ]
-        self.updated_at = datetime.now().isoformat()
+        self.positions[position_name].pop(agent_id, None)
+        self._available_ids.discard(agent_id)
+        self._assigned_ids.discard(agent_id)
+        self.updated_at = _now_iso()
         return True
     
+    def set_agent_availability(self, agent: AgentInPosition, available: bool):
+        """更新 Agent 可用状态"""
+        agent.availability = available
+        self._track_agent(agent)
+    
+    def _track_agent(self, agent: AgentInPosition):
+        """按可用状态登记 Agent"""
+        if agent.availability:
+            self._assigned_ids.discard(agent.agent_id)
+            self._available_ids.add(agent.agent_id)
+        else:
+            self._available_ids.discard(agent.agent_id)
+            self._assigned_ids.add(agent.agent_id)
+    
+    @property
+    def position_names(self) -> Tuple[str, ...]:
+        """职位名称（按添加顺序，职位未变化时复用同一元组）"""
+        if len(self._position_names) != len(self.positions):
+            self._position_names = tuple(self.positions)
+        return self._position_names
+    
+    @property
+    def total_agents(self) -> int:
+        """部门 Agent 总数"""
+        return len(self._available_ids) + len(self._assigned_ids)
+    
+    @property
+    def available_agents(self) -> int:
+        """部门可用 Agent 数"""
+        return len(self._available_ids)
+    
     def get_all_agents(self) -> List[AgentInPosition]:
         """获取部门所有 Agent"""
         all_agents = []
         for agents_in_position in self.positions.values():
-            all_agents.extend(agents_in_position)
+            all_agents.extend(agents_in_position.values())
         return all_agents
     
     def get_available_agents(self) -> List[AgentInPosition]:
         """获取部门可用 Agent（未被分配到 Unit）"""
-        return [a for a in self.get_all_agents() if a.availability]
+        # 可用 / 已分配集合已维护好，全部可用或全部已分配时无需逐个检查
+        if not self._available_ids:
+            return []
+        if not self._assigned_ids:
+            return self.get_all_agents()
+        available_ids = self._available_ids
+        return [a for a in self.get_all_agents() if a.agent_id in available_ids]
     
     def get_agents_by_position(self, position_name: str) -> List[AgentInPosition]:
         """按职位获取 Agent"""
-        return self.positions.get(position_name, [])
+        agents = self.positions.get(position_name)
+        return list(agents.values()) if agents else []
     
     def get_agents_by_skill(self, skill: str) -> List[AgentInPosition]:
         """按技能获取 Agent"""
         return [
             a for a in self.get_all_agents() 
-            if skill in a.skills
+            if skill in a.skills_set
         ]
     
     def to_dict(self) -> Dict:
@@ -152,8 +286,12 @@ class Department:
             "description": self.description,
             "lead_agent_id": self.lead_agent_id,
             "lead_agent_name": self.lead_agent_name,
+            "position_defs": {
+                pos_name: position.to_dict()
+                for pos_name, position in self.position_defs.items()
+            },
             "positions": {
-                pos_name: [a.to_dict() for a in agents]
+                pos_name: [a.to_dict_light() for a in agents.values()]
                 for pos_name, agents in self.positions.items()
             },
             "created_at": self.created_at,
@@ -161,28 +299,94 @@ class Department:
         }
 
 
+# 仍存活的 DepartmentSystem；进程退出时统一写盘剩余修改
+_LIVE_SYSTEMS: "weakref.WeakSet[DepartmentSystem]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_systems():
+    for system in list(_LIVE_SYSTEMS):
+        system.flush()
+
+
+def _with_save_lock(method):
+    """修改部门数据的方法持有 _save_lock 执行，避免与定时器线程的写盘交错"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._save_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class DepartmentSystem:
     """部门管理系统"""
     
-    def __init__(self, storage_file: str = "/Users/viosson/departments_config.json"):
-        self.storage_file = storage_file
+    def __init__(
+        self,
+        storage_dir: str = "/Users/viosson/departments",
+        autosave_interval: float = 0.5,
+        autosave_every: int = 50,
+        storage_file: Optional[str] = None
+    ):
+        self.storage_dir = storage_dir  # 每个部门单独保存为 {dept_id}.json
+        # storage_file 已弃用：仅作为旧版单文件配置的迁移来源
+        if storage_file is not None:
+            warnings.warn(
+                "DepartmentSystem(storage_file=...) 已弃用，请改用 storage_dir；"
+                "该文件只在 storage_dir 为空时迁移一次",
+                DeprecationWarning,
+                stacklevel=2
+            )
+        self.legacy_storage_file = storage_file or _LEGACY_STORAGE_FILE
+        # 合并写盘: 距上次保存超过 autosave_interval 秒或累计 autosave_every 次修改才落盘
+        self.autosave_interval = autosave_interval
+        self.autosave_every = autosave_every
+        self._dirty_depts: Set[str] = set()
+        self._pending_changes = 0
+        self._last_saved_at = float("-inf")
+        # 未达到阈值的修改由定时器在 autosave_interval 后写盘，突发修改的最后几次也不会只留在内存中
+        self._flush_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.RLock()  # 定时器线程写盘与修改部门数据互斥
+        self.version = 0  # 每次修改递增，供上层判断缓存的统计是否过期
+        # dept_id -> 最近一次 to_dict() 结果，部门被修改（_mark_dirty）时失效
+        self._snapshot: Dict[str, Dict] = {}
         self.departments: Dict[str, Department] = {}
+        # agent_id -> Agent 索引，避免逐部门/逐职位线性扫描
+        self._agent_index: Dict[str, AgentInPosition] = {}
+        self._agent_seq: Dict[str, int] = {}  # 加入顺序，保证搜索结果顺序稳定
+        self._seq_counter = itertools.count()
+        # 倒排索引: 技能 / 职位等级 / 部门类型 -> {agent_id}
+        self._skill_index: Dict[str, Set[str]] = {}
+        self._level_index: Dict[PositionLevel, Set[str]] = {}
+        self._dept_type_index: Dict[DepartmentType, Set[str]] = {}
+        # 全局可用 / 已分配集合
+        self._available_ids: Set[str] = set()
+        self._assigned_ids: Set[str] = set()
         self.load_departments()
+        _LIVE_SYSTEMS.add(self)  # 进程退出时写盘（弱引用，不会让对象常驻内存）
     
+    @_with_save_lock
     def create_department(
         self, 
         dept_id: str,
         name: str,
-        dept_type: DepartmentType,
+        dept_type: Union[DepartmentType, str],
         description: str,
         lead_agent_id: str,
         lead_agent_name: str
     ) -> Optional[Department]:
         """创建部门"""
         if dept_id in self.departments:
-            print(f"⚠️ 部门 {dept_id} 已存在")
+            logger.warning("⚠️ 部门 %s 已存在", dept_id)
             return None
         
+        # 创建时统一为枚举（也接受 "technology" 之类的值），之后各处可直接取 .value
+        if not isinstance(dept_type, DepartmentType):
+            try:
+                dept_type = _DEPARTMENT_TYPE_BY_VALUE[dept_type]
+            except KeyError:
+                raise ValueError(f"未知的部门类型: {dept_type!r}") from None
+        
         dept = Department(
             id=dept_id,
             name=name,
@@ -193,8 +397,8 @@ class DepartmentSystem:
         )
         
         self.departments[dept_id] = dept
-        self.save_departments()
-        print(f"✓ 部门 '{name}' 创建成功 (负责人: {lead_agent_name})")
+        self._mark_dirty(dept_id)
+        logger.info("✓ 部门 '%s' 创建成功 (负责人: %s)", name, lead_agent_name)
         return dept
     
     def get_department(self, dept_id: str) -> Optional[Department]:
@@ -209,6 +413,7 @@ class DepartmentSystem:
         """按类型列出部门"""
         return [d for d in self.departments.values() if d.type == dept_type]
     
+    @_with_save_lock
     def add_position_to_department(
         self,
         dept_id: str,
@@ -219,15 +424,14 @@ class DepartmentSystem:
         if not dept:
             return False
         
-        if position.name in dept.positions:
+        if not dept.add_position(position):
             return True  # 职位已存在
         
-        dept.positions[position.name] = []
-        dept.updated_at = datetime.now().isoformat()
-        self.save_departments()
-        print(f"✓ 职位 '{position.name}' 已添加到部门 '{dept.name}'")
+        self._mark_dirty(dept_id)
+        logger.info("✓ 职位 '%s' 已添加到部门 '%s'", position.name, dept.name)
         return True
     
+    @_with_save_lock
     def add_agent_to_department(
         self,
         dept_id: str,
@@ -238,177 +442,487 @@ class DepartmentSystem:
         if not dept:
             return False
         
+        if self.has_agent(agent.agent_id):
+            logger.warning("⚠️ Agent %s 已存在", agent.agent_id)
+            return False
+        
         result = dept.add_agent_to_position(agent)
         if result:
-            self.save_departments()
-            print(f"✓ Agent '{agent.agent_name}' 已添加到部门 '{dept.name}' (职位: {agent.position.name})")
+            self._index_agent(agent, dept)
+            self._mark_dirty(dept_id)
+            logger.info("✓ Agent '%s' 已添加到部门 '%s' (职位: %s)", agent.agent_name, dept.name, agent.position.name)
         return result
     
+    @_with_save_lock
+    def add_agents_to_department(
+        self,
+        dept_id: str,
+        agents: List[AgentInPosition]
+    ) -> List[bool]:
+        """批量添加 Agent 到部门（部门只查找一次，全部加入后统一标记修改）"""
+        dept = self.get_department(dept_id)
+        if not dept:
+            return [False] * len(agents)
+        
+        results = []
+        for agent in agents:
+            if agent.agent_id in self._agent_index:
+                logger.warning("⚠️ Agent %s 已存在", agent.agent_id)
+                results.append(False)
+                continue
+            
+            result = dept.add_agent_to_position(agent)
+            if result:
+                self._index_agent(agent, dept)
+                logger.info("✓ Agent '%s' 已添加到部门 '%s' (职位: %s)", agent.agent_name, dept.name, agent.position.name)
+            results.append(result)
+        
+        if any(results):
+            self._mark_dirty(dept_id)
+        return results
+    
+    @_with_save_lock
+    def remove_agent_from_department(self, agent_id: str) -> bool:
+        """从部门移除 Agent"""
+        agent = self._agent_index.get(agent_id)
+        if not agent:
+            return False
+        
+        dept = self.get_department(agent.department_id)
+        if dept:
+            dept.remove_agent_from_position(agent_id, agent.position.name)
+        self._unindex_agent(agent, dept)
+        self._mark_dirty(agent.department_id)
+        logger.info("✓ Agent '%s' 已从部门移除", agent.agent_name)
+        return True
+    
+    @_with_save_lock
     def assign_agent_to_unit(
         self,
         agent_id: str,
         unit_id: str
     ) -> bool:
         """将 Agent 分配到 Unit"""
-        for dept in self.departments.values():
-            for agents_list in dept.positions.values():
-                for agent in agents_list:
-                    if agent.agent_id == agent_id:
-                        agent.availability = False
-                        agent.assigned_unit_id = unit_id
-                        self.save_departments()
-                        print(f"✓ Agent '{agent.agent_name}' 已分配到 Unit '{unit_id}'")
-                        return True
-        return False
+        agent = self._agent_index.get(agent_id)
+        if not agent:
+            return False
+        return self.assign_agent_obj(agent, unit_id)
+    
+    @_with_save_lock
+    def assign_agent_obj(self, agent: AgentInPosition, unit_id: str) -> bool:
+        """将已取得的 Agent 对象分配到 Unit（调用方已查到 Agent 时免去再次查找）"""
+        self._set_availability(agent, False)
+        agent.assigned_unit_id = unit_id
+        self._mark_dirty(agent.department_id)
+        logger.info("✓ Agent '%s' 已分配到 Unit '%s'", agent.agent_name, unit_id)
+        return True
     
+    @_with_save_lock
     def release_agent_from_unit(self, agent_id: str) -> bool:
         """将 Agent 从 Unit 释放回部门"""
-        for dept in self.departments.values():
-            for agents_list in dept.positions.values():
-                for agent in agents_list:
-                    if agent.agent_id == agent_id:
-                        agent.availability = True
-                        agent.assigned_unit_id = None
-                        self.save_departments()
-                        print(f"✓ Agent '{agent.agent_name}' 已从 Unit 释放")
-                        return True
-        return False
+        agent = self._agent_index.get(agent_id)
+        if not agent:
+            return False
+        
+        self._set_availability(agent, True)
+        agent.assigned_unit_id = None
+        self._mark_dirty(agent.department_id)
+        logger.info("✓ Agent '%s' 已从 Unit 释放", agent.agent_name)
+        return True
+    
+    @_with_save_lock
+    def release_agents_from_unit(self, agent_ids: Iterable[str]) -> int:
+        """批量将 Agent 从 Unit 释放回部门（可用集合一次更新，每个部门只标记一次修改），返回释放数量"""
+        released = []
+        dept_ids = set()
+        for agent_id in agent_ids:
+            agent = self._agent_index.get(agent_id)
+            if not agent:
+                continue
+            dept = self.get_department(agent.department_id)
+            if dept:
+                dept.set_agent_availability(agent, True)
+            else:
+                agent.availability = True
+            agent.assigned_unit_id = None
+            released.append(agent_id)
+            dept_ids.add(agent.department_id)
+            logger.info("✓ Agent '%s' 已从 Unit 释放", agent.agent_name)
+        
+        self._assigned_ids.difference_update(released)
+        self._available_ids.update(released)
+        for dept_id in dept_ids:
+            self._mark_dirty(dept_id)
+        return len(released)
     
     def get_agent_by_id(self, agent_id: str) -> Optional[AgentInPosition]:
         """按 ID 查找 Agent"""
-        for dept in self.departments.values():
-            for agents_list in dept.positions.values():
-                for agent in agents_list:
-                    if agent.agent_id == agent_id:
-                        return agent
-        return None
+        return self._agent_index.get(agent_id)
+    
+    def has_agent(self, agent_id: str) -> bool:
+        """Agent 是否已在任一部门中"""
+        return agent_id in self._agent_index
     
     def search_agents(
         self,
         skills: Optional[List[str]] = None,
         position_level: Optional[PositionLevel] = None,
         available_only: bool = False,
-        dept_type: Optional[DepartmentType] = None
+        dept_type: Optional[DepartmentType] = None,
+        limit: Optional[int] = None
     ) -> List[AgentInPosition]:
-        """搜索 Agent"""
-        results = []
+        """搜索 Agent（按加入顺序返回，limit 为返回数量上限）"""
+        # 每个过滤条件对应一个 agent_id 集合；技能为“任一匹配”，保留各技能的倒排集合
+        filter_sets: List[Set[str]] = []
+        skill_sets: List[Set[str]] = []
         
-        for dept in self.departments.values():
-            # 按部门类型过滤
-            if dept_type and dept.type != dept_type:
-                continue
-            
-            for agents_list in dept.positions.values():
-                for agent in agents_list:
-                    # 按可用性过滤
-                    if available_only and not agent.availability:
-                        continue
-                    
-                    # 按职位等级过滤
-                    if position_level and agent.position.level != position_level:
-                        continue
-                    
-                    # 按技能过滤
-                    if skills:
-                        if not any(skill in agent.skills for skill in skills):
-                            continue
-                    
-                    results.append(agent)
+        # 按技能过滤（任一技能匹配即可）
+        if skills:
+            skill_sets = [self._skill_index[skill] for skill in skills if skill in self._skill_index]
+            if not skill_sets:
+                return []
+        
+        # 按职位等级过滤
+        if position_level:
+            filter_sets.append(self._level_index.get(position_level, set()))
+        
+        # 按部门类型过滤
+        if dept_type:
+            filter_sets.append(self._dept_type_index.get(dept_type, set()))
+        
+        # 按可用性过滤
+        if available_only:
+            filter_sets.append(self._available_ids)
+        
+        if not filter_sets and not skill_sets:
+            return list(itertools.islice(self._agent_index.values(), limit or None))
+        
+        filter_sets.sort(key=len)
+        
+        # 只需前 limit 个且条件很宽时，按加入顺序扫描、凑够即停，不必先求出完整的并集 / 交集。
+        # 扫描约需 limit * N / smallest 步，求交集约需 smallest 步，取较小者
+        sizes = [len(ids) for ids in filter_sets]
+        if skill_sets:
+            sizes.append(sum(map(len, skill_sets)))  # 技能并集大小的上界
+        smallest = min(sizes)
+        if limit and limit * len(self._agent_index) < smallest * smallest:
+            return list(itertools.islice(
+                (
+                    agent
+                    for agent_id, agent in self._agent_index.items()
+                    if all(agent_id in ids for ids in filter_sets)
+                    and (not skill_sets or any(agent_id in ids for ids in skill_sets))
+                ),
+                limit
+            ))
+        
+        if skill_sets:
+            filter_sets.insert(0, set().union(*skill_sets))
+            filter_sets.sort(key=len)
+        candidates = set(filter_sets[0])
+        for ids in filter_sets[1:]:
+            if not candidates:
+                break
+            candidates &= ids
+        
+        # 只需前 limit 个时用堆取最小的 limit 个，免去对全部候选排序
+        if limit and limit < len(candidates):
+            ordered = heapq.nsmallest(limit, candidates, key=self._agent_seq.__getitem__)
+        else:
+            ordered = sorted(candidates, key=self._agent_seq.__getitem__)
+        results = [self._agent_index[agent_id] for agent_id in ordered]
         
         return results
     
     def get_statistics(self) -> Dict[str, Any]:
         """获取统计信息"""
-        total_agents = 0
-        available_agents = 0
-        assigned_agents = 0
-        
-        for dept in self.departments.values():
-            dept_agents = dept.get_all_agents()
-            total_agents += len(dept_agents)
-            available_agents += len(dept.get_available_agents())
-            assigned_agents += len([a for a in dept_agents if not a.availability])
+        available_agents = len(self._available_ids)
+        assigned_agents = len(self._assigned_ids)
         
         return {
             "total_departments": len(self.departments),
-            "total_agents": total_agents,
+            "total_agents": available_agents + assigned_agents,
             "available_agents": available_agents,
             "assigned_agents": assigned_agents,
             "departments": {
                 dept_id: {
                     "name": dept.name,
                     "type": dept.type.value,
-                    "total_agents": len(dept.get_all_agents()),
-                    "available_agents": len(dept.get_available_agents())
+                    "total_agents": dept.total_agents,
+                    "available_agents": dept.available_agents
                 }
                 for dept_id, dept in self.departments.items()
             }
         }
     
+    def _index_agent(self, agent: AgentInPosition, dept: Department):
+        """将 Agent 写入各索引"""
+        agent_id = agent.agent_id
+        self._agent_index[agent_id] = agent
+        self._agent_seq[agent_id] = next(self._seq_counter)
+        for skill in agent.skills_set:
+            self._skill_index.setdefault(skill, set()).add(agent_id)
+        self._level_index.setdefault(agent.position.level, set()).add(agent_id)
+        self._dept_type_index.setdefault(dept.type, set()).add(agent_id)
+        if agent.availability:
+            self._available_ids.add(agent_id)
+        else:
+            self._assigned_ids.add(agent_id)
+    
+    def _unindex_agent(self, agent: AgentInPosition, dept: Optional[Department]):
+        """从各索引中移除 Agent"""
+        agent_id = agent.agent_id
+        self._agent_index.pop(agent_id, None)
+        self._agent_seq.pop(agent_id, None)
+        self._available_ids.discard(agent_id)
+        self._assigned_ids.discard(agent_id)
+        for skill in agent.skills_set:
+            self._skill_index.get(skill, set()).discard(agent_id)
+        self._level_index.get(agent.position.level, set()).discard(agent_id)
+        if dept:
+            self._dept_type_index.get(dept.type, set()).discard(agent_id)
+    
+    def _set_availability(self, agent: AgentInPosition, available: bool):
+        """同步更新 Agent 可用状态及可用 / 已分配集合"""
+        dept = self.get_department(agent.department_id)
+        if dept:
+            dept.set_agent_availability(agent, available)
+        else:
+            agent.availability = available
+        if available:
+            self._assigned_ids.discard(agent.agent_id)
+            self._available_ids.add(agent.agent_id)
+        else:
+            self._available_ids.discard(agent.agent_id)
+            self._assigned_ids.add(agent.agent_id)
+    
+    def _mark_dirty(self, dept_id: str):
+        """标记部门有未保存的修改，按需合并写盘"""
+        with self._save_lock:
+            self._dirty_depts.add(dept_id)
+            self._snapshot.pop(dept_id, None)
+            self.version += 1
+            self._pending_changes += 1
+            if (
+                self._pending_changes >= self.autosave_every
+                or time.monotonic() - self._last_saved_at >= self.autosave_interval
+            ):
+                self.flush()
+            elif self._flush_timer is None:
+                self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """autosave_interval 秒后写盘剩余的修改（调用方已持有 _save_lock）"""
+        timer = threading.Timer(self.autosave_interval, self._flush_from_timer)
+        timer.daemon = True
+        self._flush_timer = timer
+        timer.start()
+    
+    def _flush_from_timer(self):
+        """定时器回调：写盘；写盘失败时重新计时"""
+        with self._save_lock:
+            self._flush_timer = None
+            self.flush()
+            if self._dirty_depts and self._flush_timer is None:
+                self._schedule_flush()
+    
+    def flush(self):
+        """将有修改的部门写入磁盘"""
+        with self._save_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty_depts:
+                return
+            self._save(list(self._dirty_depts))
+    
     def save_departments(self):
-        """保存部门配置"""
-        data = {
-            dept_id: dept.to_dict()
-            for dept_id, dept in self.departments.items()
-        }
+        """保存全部部门配置"""
+        with self._save_lock:
+            self._save(list(self.departments))
+    
+    def _save(self, dept_ids: List[str]):
+        """逐个部门写入 {storage_dir}/{dept_id}.json"""
         try:
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.makedirs(self.storage_dir, exist_ok=True)
+            for dept_id in dept_ids:
+                dept = self.departments.get(dept_id)
+                if dept is None:
+                    continue
+                data = self._snapshot.get(dept_id)
+                if data is None:
+                    data = self._snapshot[dept_id] = dept.to_dict()
+                path = os.path.join(self.storage_dir, f"{dept_id}.json")
+                tmp_path = path + ".tmp"
+                if orjson is not None:
+                    with open(tmp_path, 'wb') as f:
+                        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                else:
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_path, path)
+                self._dirty_depts.discard(dept_id)
         except Exception as e:
-            print(f"❌ 保存部门配置失败: {e}")
+            logger.error("❌ 保存部门配置失败: %s", e)
+            return
+        
+        self._pending_changes = 0
+        self._last_saved_at = time.monotonic()
     
     def load_departments(self):
         """加载部门配置"""
         try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            for dept_id, dept_data in data.items():
-                dept = Department(
-                    id=dept_data["id"],
-                    name=dept_data["name"],
-                    type=DepartmentType(dept_data["type"]),
-                    description=dept_data["description"],
-                    lead_agent_id=dept_data["lead_agent_id"],
-                    lead_agent_name=dept_data["lead_agent_name"],
-                    created_at=dept_data.get("created_at"),
-                    updated_at=dept_data.get("updated_at")
-                )
-                
-                # 恢复职位和 Agent
-                for pos_name, agents_data in dept_data.get("positions", {}).items():
-                    # 恢复职位（从第一个 agent 的数据中取）
-                    if agents_data:
-                        first_agent_pos_data = agents_data[0]["position"]
-                        position = Position(
-                            name=first_agent_pos_data["name"],
-                            level=PositionLevel(first_agent_pos_data["level"]),
-                            description=first_agent_pos_data["description"],
-                            required_skills=first_agent_pos_data["required_skills"],
-                            max_agents=first_agent_pos_data["max_agents"]
-                        )
-                        dept.add_position(position)
-                        
-                        # 恢复 Agent
-                        for agent_data in agents_data:
-                            agent = AgentInPosition(
-                                agent_id=agent_data["agent_id"],
-                                agent_name=agent_data["agent_name"],
-                                position=position,
-                                department_id=agent_data["department_id"],
-                                skills=agent_data["skills"],
-                                availability=agent_data["availability"],
-                                assigned_unit_id=agent_data.get("assigned_unit_id"),
-                                joined_at=agent_data["joined_at"]
-                            )
-                            dept.positions[pos_name].append(agent)
-                
-                self.departments[dept_id] = dept
+            paths = [
+                entry.path for entry in os.scandir(self.storage_dir)
+                if entry.is_file() and entry.name.endswith(".json")
+            ]
+        except FileNotFoundError:
+            paths = []
+        
+        if not paths:
+            self._migrate_legacy_file()
+            return
         
+        # (排序用的顶层字段, 文件路径, 完整数据)；大文件只先读顶层字段，完整数据为 None
+        loaded = []
+        for path in paths:
+            try:
+                if ijson is not None and os.path.getsize(path) >= _STREAM_LOAD_THRESHOLD:
+                    loaded.append((self._read_department_header(path), path, None))
+                    continue
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                dept_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                loaded.append((dept_data, path, dept_data))
+            except Exception as e:
+                logger.warning("⚠️ 加载部门配置失败 (%s): %s", path, e)
+        
+        # 按创建时间恢复部门顺序
+        loaded.sort(key=lambda item: (item[0].get("created_at") or "", item[0].get("id", "")))
+        for header, path, dept_data in loaded:
+            try:
+                if dept_data is None:
+                    self._load_department_streaming(header, path)
+                else:
+                    self._load_department(dept_data)
+            except Exception as e:
+                logger.warning("⚠️ 加载部门配置失败: %s", e)
+    
+    def _migrate_legacy_file(self):
+        """storage_dir 中还没有部门文件时，读入旧版单文件配置并拆分为每部门一个文件"""
+        try:
+            with open(self.legacy_storage_file, 'rb') as f:
+                raw = f.read()
         except FileNotFoundError:
-            pass
+            return
+        
+        try:
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception as e:
-            print(f"⚠️ 加载部门配置失败: {e}")
+            logger.warning("⚠️ 加载旧版部门配置失败 (%s): %s", self.legacy_storage_file, e)
+            return
+        
+        for dept_data in data.values():
+            try:
+                self._load_department(dept_data)
+            except Exception as e:
+                logger.warning("⚠️ 加载部门配置失败: %s", e)
+        
+        if self.departments:
+            # 旧文件保留不动；之后 storage_dir 非空，不会再次迁移
+            self.save_departments()
+            logger.info(
+                "✓ 已将 %s 中的 %d 个部门迁移到 %s",
+                self.legacy_storage_file, len(self.departments), self.storage_dir
+            )
+    
+    @staticmethod
+    def _read_department_header(path: str) -> Dict[str, Any]:
+        """流式读取部门文件的顶层标量字段"""
+        with open(path, 'rb') as f:
+            return {
+                prefix: value for prefix, event, value in ijson.parse(f)
+                if prefix in _DEPT_HEADER_FIELDS and event in ("string", "number", "boolean", "null")
+            }
+    
+    def _load_department(self, dept_data: Dict[str, Any]):
+        """由 JSON 数据恢复单个部门"""
+        dept = self._department_from_header(dept_data)
+        self._restore_positions(
+            dept,
+            dept_data.get("position_defs", {}).items(),
+            dept_data.get("positions", {}).items()
+        )
+        self.departments[dept.id] = dept
+    
+    def _load_department_streaming(self, header: Dict[str, Any], path: str):
+        """流式恢复单个部门：逐个职位解析并构造 Agent，不整体载入文件"""
+        dept = self._department_from_header(header)
+        with open(path, 'rb') as defs_f, open(path, 'rb') as agents_f:
+            self._restore_positions(
+                dept,
+                ijson.kvitems(defs_f, "position_defs"),
+                ijson.kvitems(agents_f, "positions")
+            )
+        self.departments[dept.id] = dept
+    
+    @staticmethod
+    def _department_from_header(dept_data: Dict[str, Any]) -> Department:
+        """由顶层字段构造（尚无职位的）部门"""
+        return Department(
+            id=dept_data["id"],
+            name=dept_data["name"],
+            type=_DEPARTMENT_TYPE_BY_VALUE[dept_data["type"]],
+            description=dept_data["description"],
+            lead_agent_id=dept_data["lead_agent_id"],
+            lead_agent_name=dept_data["lead_agent_name"],
+            created_at=dept_data.get("created_at"),
+            updated_at=dept_data.get("updated_at")
+        )
+    
+    def _restore_positions(self, dept: Department, position_defs_items, positions_items):
+        """恢复职位定义和各职位下的 Agent（参数为 (职位名, 数据) 的可迭代对象）"""
+        # 恢复职位定义（直接写入，保留文件中的 updated_at）
+        for pos_name, pos_data in position_defs_items:
+            dept.position_defs[pos_name] = self._position_from_dict(pos_data)
+            dept.positions[pos_name] = {}
+        
+        # 恢复 Agent
+        for pos_name, agents_data in positions_items:
+            position = dept.position_defs.get(pos_name)
+            if position is None:
+                # 旧格式: 职位定义嵌在每个 agent 中，从第一个 agent 的数据中取
+                if not agents_data:
+                    continue
+                position = self._position_from_dict(agents_data[0]["position"])
+                dept.position_defs[pos_name] = position
+            dept.positions.setdefault(pos_name, {})
+            
+            for agent_data in agents_data:
+                agent = AgentInPosition(
+                    agent_id=agent_data["agent_id"],
+                    agent_name=agent_data["agent_name"],
+                    position=position,
+                    department_id=agent_data["department_id"],
+                    skills=agent_data["skills"],
+                    availability=agent_data["availability"],
+                    assigned_unit_id=agent_data.get("assigned_unit_id"),
+                    joined_at=agent_data["joined_at"]
+                )
+                dept.positions[pos_name][agent.agent_id] = agent
+                dept._track_agent(agent)
+                self._index_agent(agent, dept)
+    
+    @staticmethod
+    def _position_from_dict(pos_data: Dict[str, Any]) -> Position:
+        """由 JSON 数据恢复职位"""
+        return Position(
+            name=pos_data["name"],
+            level=_POSITION_LEVEL_BY_VALUE[pos_data["level"]],
+            description=pos_data["description"],
+            required_skills=pos_data["required_skills"],
+            max_agents=pos_data["max_agents"]
+        )
 
 
 # 预定义职位
@@ -476,3 +990,10 @@ PREDEFINED_POSITIONS = {
         ),
     }
 }
+
+# 按部门类型枚举直接索引预定义职位（PREDEFINED_POSITIONS 以类型值为键）
+PREDEFINED_POSITIONS_BY_TYPE: Dict[DepartmentType, Dict[str, Position]] = {
+    dept_type: PREDEFINED_POSITIONS[dept_type.value]
+    for dept_type in DepartmentType
+    if dept_type.value in PREDEFINED_POSITIONS
+}
@@ -4,7 +4,9 @@ Agent 协调器
 """
 
 import json
-from typing import Any, Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -27,7 +29,7 @@ class TaskStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """任务定义"""
     id: str
@@ -37,11 +39,16 @@ class Task:
     priority: TaskPriority = TaskPriority.NORMAL
     status: TaskStatus = TaskStatus.PENDING
     parameters: Dict[str, Any] = field(default_factory=dict)
+    depends_on: List[str] = field(default_factory=list)  # 前置任务 ID
     result: Any = None
     error: str = None
     created_at: str = None
     completed_at: str = None
     
+    # 创建任务时绑定的 Agent 实例及其 execute_task，执行时免去再次查找
+    _agent_ref: Any = field(default=None, init=False, repr=False, compare=False)
+    _execute_fn: Optional[Callable] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now().isoformat()
@@ -52,13 +59,20 @@ class AgentOrchestrator:
     
     def __init__(self):
         self.agents: Dict[str, Any] = {}  # agent_id -> agent instance
+        self._agent_exec: Dict[str, Optional[Callable]] = {}  # agent_id -> 绑定的 execute_task（不支持则为 None）
         self.tasks: Dict[str, Task] = {}  # task_id -> task
         self.task_history: List[Task] = []
         self.workflows: Dict[str, List[str]] = {}  # workflow_id -> [task_ids]
+        # task_history 中完成 / 失败任务数，避免统计时遍历历史
+        self._completed_count = 0
+        self._failed_count = 0
+        self._task_counter = 0  # 单调递增的任务编号，保证同一时刻创建的任务 ID 不冲突
+        self._lock = threading.Lock()  # 并行执行时保护统计计数和历史
     
     def register_agent(self, agent_id: str, agent: Any):
         """注册 Agent"""
         self.agents[agent_id] = agent
+        self._agent_exec[agent_id] = getattr(agent, 'execute_task', None)
         print(f"✓ Agent '{agent_id}' 已注册")
     
     def create_task(
@@ -67,21 +81,26 @@ class AgentOrchestrator:
         name: str,
         description: str,
         parameters: Dict[str, Any] = None,
-        priority: TaskPriority = TaskPriority.NORMAL
+        priority: TaskPriority = TaskPriority.NORMAL,
+        depends_on: Optional[List[str]] = None
     ) -> Task:
         """创建任务"""
         if agent_id not in self.agents:
             raise ValueError(f"Agent {agent_id} 不存在")
         
-        task_id = f"task_{datetime.now().timestamp()}"
+        self._task_counter += 1
+        task_id = f"task_{self._task_counter}"
         task = Task(
             id=task_id,
             name=name,
             description=description,
             agent_id=agent_id,
             priority=priority,
-            parameters=parameters or {}
+            parameters=parameters or {},
+            depends_on=depends_on or []
         )
+        task._agent_ref = self.agents[agent_id]
+        task._execute_fn = self._agent_exec[agent_id]
         
         self.tasks[task_id] = task
         print(f"📋 任务 '{name}' 已创建 (ID: {task_id})")
@@ -93,7 +112,11 @@ class AgentOrchestrator:
             raise ValueError(f"任务 {task_id} 不存在")
         
         task = self.tasks[task_id]
-        agent = self.agents.get(task.agent_id)
+        agent = task._agent_ref
+        execute_fn = task._execute_fn
+        if agent is None:
+            agent = self.agents.get(task.agent_id)
+            execute_fn = self._agent_exec.get(task.agent_id)
         
         if not agent:
             task.status = TaskStatus.FAILED
@@ -104,8 +127,8 @@ class AgentOrchestrator:
         task.status = TaskStatus.EXECUTING
         
         try:
-            if hasattr(agent, 'execute_task'):
-                result = agent.execute_task(
+            if execute_fn is not None:
+                result = execute_fn(
                     task.parameters.get('type'),
                     task.parameters.get('project_id')
                 )
@@ -122,25 +145,50 @@ class AgentOrchestrator:
             task.error = str(e)
             print(f"❌ 任务失败: {str(e)}")
         
-        self.task_history.append(task)
+        with self._lock:
+            if task.status == TaskStatus.COMPLETED:
+                self._completed_count += 1
+            else:
+                self._failed_count += 1
+            self.task_history.append(task)
         return task
     
-    def execute_workflow(self, tasks: List[Task], parallel: bool = False) -> List[Task]:
-        """执行工作流（任务序列）"""
+    def execute_workflow(
+        self,
+        tasks: List[Task],
+        parallel: bool = False,
+        max_workers: int = 8
+    ) -> List[Task]:
+        """执行工作流（任务序列）
+        
+        parallel=True 时按 depends_on 分层，同一层内互不依赖的任务并发执行；
+        依赖工作流之外的任务视为已满足。
+        """
         print(f"\n{'='*60}")
         print(f"🔄 执行工作流 ({len(tasks)} 个任务)")
         print(f"{'='*60}")
         
-        results = []
+        if not parallel or len(tasks) <= 1:
+            return [self.execute_task(task.id) for task in tasks]
         
-        if parallel:
-            print("⚠️ 并行模式暂未实现，使用顺序执行")
+        results: Dict[str, Task] = {}
+        pending = {task.id: task for task in tasks}
         
-        for task in tasks:
-            result = self.execute_task(task.id)
-            results.append(result)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+            while pending:
+                ready = [
+                    task for task in pending.values()
+                    if not any(dep in pending for dep in task.depends_on)
+                ]
+                if not ready:
+                    print("⚠️ 检测到循环依赖，剩余任务一并执行")
+                    ready = list(pending.values())
+                
+                for task, result in zip(ready, executor.map(lambda t: self.execute_task(t.id), ready)):
+                    results[task.id] = result
+                    del pending[task.id]
         
-        return results
+        return [results[task.id] for task in tasks]
     
     def create_daily_pipeline(self, project_id: str = None) -> List[str]:
         """创建日常工作流"""
@@ -183,7 +231,8 @@ class AgentOrchestrator:
             name="生成日报",
             description="根据分析结果生成日报",
             parameters={"type": "daily_report", "project_id": project_id},
-            priority=TaskPriority.HIGH
+            priority=TaskPriority.HIGH,
+            depends_on=[health_task.id, error_task.id, perf_task.id]
         )
         task_ids.append(report_task.id)
         
@@ -229,9 +278,9 @@ class AgentOrchestrator:
     
     def get_statistics(self) -> Dict[str, Any]:
         """获取统计信息"""
-        total_tasks = len(self.task_history)
-        completed = sum(1 for t in self.task_history if t.status == TaskStatus.COMPLETED)
-        failed = sum(1 for t in self.task_history if t.status == TaskStatus.FAILED)
+        completed = self._completed_count
+        failed = self._failed_count
+        total_tasks = completed + failed
         
         return {
             "total_tasks": total_tasks,
@@ -1,9 +1,44 @@
+import itertools
 import json
-from typing import Any, Dict, List
-from dataclasses import dataclass, asdict
+import logging
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, TypedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # 未安装 msgspec 时逐字段手动恢复
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+
+# 同一毫秒内复用时间戳字符串，批量创建成员 / 任务时不必每次格式化
+_NOW_CACHE_TTL = 0.001  # 秒
+_now_cache = ("", float("-inf"))
+
+
+def _now_iso() -> str:
+    """返回当前时间的 ISO 字符串（_NOW_CACHE_TTL 内复用）"""
+    global _now_cache
+    text, stamp = _now_cache
+    now = time.monotonic()
+    if now - stamp >= _NOW_CACHE_TTL:
+        text = datetime.now().isoformat()
+        _now_cache = (text, now)
+    return text
+
 
 class AgentRole(Enum):
     """Agent 角色"""
@@ -22,7 +57,11 @@ class AgentStatus(Enum):
     ERROR = "error"
 
 
-@dataclass
+# 枚举值 -> 成员，加载配置时直接查表
+_AGENT_ROLE_BY_VALUE: Dict[str, AgentRole] = {e.value: e for e in AgentRole}
+
+
+@dataclass(slots=True)
 class AgentProfile:
     """Agent 配置文件"""
     id: str
@@ -35,10 +74,21 @@ class AgentProfile:
     
     def __post_init__(self):
         if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
+            self.created_at = _now_iso()
+    
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "role": self.role.value,
+            "description": self.description,
+            "instructions": self.instructions,
+            "tools": self.tools,
+            "created_at": self.created_at
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentTask:
     """Agent 任务"""
     id: str
@@ -51,7 +101,32 @@ class AgentTask:
     
     def __post_init__(self):
         if self.created_at is None:
-            self.created_at = datetime.now().isoformat()
+            self.created_at = _now_iso()
+
+
+class _AgentsConfig(TypedDict):
+    """agents_config.json 的结构（供 msgspec 解码）"""
+    agents: List[AgentProfile]
+
+
+_AGENTS_DECODER = msgspec.json.Decoder(_AgentsConfig) if msgspec is not None else None
+
+
+# print_agent_info 的输出模板，整段一次写出
+_AGENT_INFO_TEMPLATE = (
+    "\n" + "=" * 60 + "\n"
+    "🤖 Agent 信息\n"
+    + "=" * 60 + "\n"
+    "ID:          {id}\n"
+    "名称:        {name}\n"
+    "角色:        {role}\n"
+    "描述:        {description}\n"
+    "可用工具:    {tools}\n"
+    "创建时间:    {created_at}\n"
+    "\n📋 系统指令:\n"
+    "{instructions}\n"
+    + "=" * 60 + "\n\n"
+)
 
 
 class AgentEmployeeSystem:
@@ -61,17 +136,20 @@ class AgentEmployeeSystem:
         self.storage_file = storage_file
         self.agents: Dict[str, AgentProfile] = {}
         self.tasks: Dict[str, AgentTask] = {}
+        self._task_counter = itertools.count()  # 任务编号，配合随机后缀保证 ID 唯一
+        self._dirty = False     # 是否有未保存的修改
+        self._autosave = True   # False 时（batch 期间）修改只标记，不立即写盘
         self.load_agents()
     
     def register_agent(self, profile: AgentProfile) -> bool:
         """注册新 Agent"""
         if profile.id in self.agents:
-            print(f"⚠️ Agent {profile.id} 已存在")
+            logger.warning("⚠️ Agent %s 已存在", profile.id)
             return False
         
         self.agents[profile.id] = profile
-        self.save_agents()
-        print(f"✓ Agent '{profile.name}' 注册成功")
+        self._mark_dirty()
+        logger.info("✓ Agent '%s' 注册成功", profile.name)
         return True
     
     def get_agent(self, agent_id: str) -> AgentProfile:
@@ -87,7 +165,7 @@ class AgentEmployeeSystem:
         if agent_id not in self.agents:
             raise ValueError(f"Agent {agent_id} 不存在")
         
-        task_id = f"task_{len(self.tasks)}_{datetime.now().timestamp()}"
+        task_id = f"task_{next(self._task_counter)}_{uuid.uuid4().hex[:8]}"
         agent_task = AgentTask(
             id=task_id,
             agent_id=agent_id,
@@ -107,48 +185,76 @@ class AgentEmployeeSystem:
             task.status = status
             task.result = result
             if status == AgentStatus.COMPLETED:
-                task.completed_at = datetime.now().isoformat()
+                task.completed_at = _now_iso()
+    
+    def _mark_dirty(self):
+        """标记有未保存的修改，非批量模式下立即保存"""
+        self._dirty = True
+        if self._autosave:
+            self.flush()
+    
+    def flush(self):
+        """有未保存的修改时写盘"""
+        if self._dirty:
+            self._dirty = False
+            self.save_agents()
+    
+    @contextmanager
+    def batch(self):
+        """批量注册期间暂停自动保存，结束时统一写盘一次"""
+        prev = self._autosave
+        self._autosave = False
+        try:
+            yield self
+        finally:
+            self._autosave = prev
+            self.flush()
     
     def save_agents(self):
         """保存 Agent 配置"""
-        agents_data = []
-        for agent in self.agents.values():
-            agent_dict = asdict(agent)
-            # 转换 Enum 为字符串
-            agent_dict['role'] = agent_dict['role'].value
-            agents_data.append(agent_dict)
-        
         data = {
-            "agents": agents_data,
-            "saved_at": datetime.now().isoformat()
+            "agents": [agent.to_dict() for agent in self.agents.values()],
+            "saved_at": _now_iso()
         }
-        with open(self.storage_file, 'w') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        # 先整块写入临时文件再原子替换，避免中途崩溃留下半个文件
+        tmp_path = self.storage_file + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, self.storage_file)
     
     def load_agents(self):
         """加载 Agent 配置"""
         try:
-            with open(self.storage_file, 'r') as f:
-                data = json.load(f)
-                for agent_data in data.get("agents", []):
-                    role_str = agent_data["role"]
-                    try:
-                        role = AgentRole(role_str)
-                    except (ValueError, KeyError):
-                        role = AgentRole.LANGFUSE_PM
-                    
-                    profile = AgentProfile(
-                        id=agent_data["id"],
-                        name=agent_data["name"],
-                        role=role,
-                        description=agent_data["description"],
-                        instructions=agent_data["instructions"],
-                        tools=agent_data["tools"],
-                        created_at=agent_data.get("created_at")
-                    )
-                    self.agents[profile.id] = profile
+            with open(self.storage_file, 'rb') as f:
+                raw = f.read()
+            if _AGENTS_DECODER is not None:
+                try:
+                    for profile in _AGENTS_DECODER.decode(raw)["agents"]:
+                        self.agents[profile.id] = profile
+                    return
+                except msgspec.ValidationError:
+                    pass  # 含未知角色等旧数据时，走下面的逐条解析
+            
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            for agent_data in data.get("agents", []):
+                role = _AGENT_ROLE_BY_VALUE.get(agent_data["role"], AgentRole.LANGFUSE_PM)
+                
+                profile = AgentProfile(
+                    id=agent_data["id"],
+                    name=agent_data["name"],
+                    role=role,
+                    description=agent_data["description"],
+                    instructions=agent_data["instructions"],
+                    tools=agent_data["tools"],
+                    created_at=agent_data.get("created_at")
+                )
+                self.agents[profile.id] = profile
         except FileNotFoundError:
-            print(f"配置文件不存在: {self.storage_file}")
+            logger.info("配置文件不存在: %s", self.storage_file)
     
     def print_agent_info(self, agent_id: str):
         """打印 Agent 信息"""
@@ -157,18 +263,15 @@ class AgentEmployeeSystem:
             print(f"❌ Agent {agent_id} 不存在")
             return
         
-        print(f"\n{'='*60}")
-        print(f"🤖 Agent 信息")
-        print(f"{'='*60}")
-        print(f"ID:          {agent.id}")
-        print(f"名称:        {agent.name}")
-        print(f"角色:        {agent.role.value}")
-        print(f"描述:        {agent.description}")
-        print(f"可用工具:    {', '.join(agent.tools)}")
-        print(f"创建时间:    {agent.created_at}")
-        print(f"\n📋 系统指令:")
-        print(f"{agent.instructions}")
-        print(f"{'='*60}\n")
+        sys.stdout.write(_AGENT_INFO_TEMPLATE.format_map({
+            "id": agent.id,
+            "name": agent.name,
+            "role": agent.role.value,
+            "description": agent.description,
+            "tools": ', '.join(agent.tools),
+            "created_at": agent.created_at,
+            "instructions": agent.instructions
+        }))
 
 
 # 创建全局系统实例
@@ -207,8 +310,6 @@ def setup_default_agents():
         ]
     )
     
-    agent_system.register_agent(langfuse_pm)
-    
     # 数据分析员
     data_analyst = AgentProfile(
         id="data_analyst_001",
@@ -232,8 +333,6 @@ def setup_default_agents():
         ]
     )
     
-    agent_system.register_agent(data_analyst)
-    
     # 开发员
     developer = AgentProfile(
         id="developer_001",
@@ -254,10 +353,15 @@ def setup_default_agents():
         ]
     )
     
-    agent_system.register_agent(developer)
+    # 一次写盘完成全部注册
+    with agent_system.batch():
+        for profile in (langfuse_pm, data_analyst, developer):
+            agent_system.register_agent(profile)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    
     print("\n" + "="*60)
     print("🤖 DEVOLLEN Agent 员工库系统")
     print("="*60)
@@ -3,11 +3,45 @@ Agent Unit System
 工作小组管理系统 - 动态组建项目小组
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from contextlib import contextmanager
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from datetime import datetime
+from functools import partial
+import itertools
 import json
+import logging
+import os
+import time
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # 未安装 msgspec 时逐字段手动恢复
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+
+# 同一毫秒内复用时间戳字符串，批量创建成员 / 任务时不必每次格式化
+_NOW_CACHE_TTL = 0.001  # 秒
+_now_cache = ("", float("-inf"))
+
+
+def _now_iso() -> str:
+    """返回当前时间的 ISO 字符串（_NOW_CACHE_TTL 内复用）"""
+    global _now_cache
+    text, stamp = _now_cache
+    now = time.monotonic()
+    if now - stamp >= _NOW_CACHE_TTL:
+        text = datetime.now().isoformat()
+        _now_cache = (text, now)
+    return text
 
 
 class UnitStatus(Enum):
@@ -26,7 +60,12 @@ class UnitRole(Enum):
     SUPPORTER = "supporter"        # 支持者
 
 
-@dataclass
+# 枚举值 -> 成员，加载配置时直接查表
+_UNIT_STATUS_BY_VALUE: Dict[str, UnitStatus] = {e.value: e for e in UnitStatus}
+_UNIT_ROLE_BY_VALUE: Dict[str, UnitRole] = {e.value: e for e in UnitRole}
+
+
+@dataclass(slots=True)
 class UnitMember:
     """Unit 成员"""
     agent_id: str
@@ -36,7 +75,16 @@ class UnitMember:
     position_name: str              # 原职位
     skills: List[str] = field(default_factory=list)
     responsibilities: str = ""      # 在 Unit 中的责任
-    added_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    added_at: str = field(default_factory=_now_iso)
+    # 字段被重新赋值时的回调：由所属 AgentUnit 设置，用于清除它的 to_dict() / to_info() 缓存
+    _on_change: Optional[Callable[[], None]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != "_on_change":
+            callback = getattr(self, "_on_change", None)
+            if callback is not None:
+                callback()
     
     def to_dict(self) -> Dict:
         return {
@@ -45,13 +93,17 @@ class UnitMember:
             "role": self.role.value,
             "department_id": self.department_id,
             "position_name": self.position_name,
-            "skills": self.skills,
+            "skills": list(self.skills),
             "responsibilities": self.responsibilities,
             "added_at": self.added_at
         }
 
 
-@dataclass
+# 保存成员的字段，重新赋值时需要重新登记成员回调
+_MEMBER_FIELDS = frozenset(("lead_member", "executor_members", "supporter_members"))
+
+
+@dataclass(slots=True)
 class AgentUnit:
     """工作小组"""
     id: str
@@ -60,40 +112,86 @@ class AgentUnit:
     project_id: Optional[str] = None  # 关联的项目 ID
     
     lead_member: Optional[UnitMember] = None  # 小组负责人（必须存在）
-    executor_members: List[UnitMember] = field(default_factory=list)  # 执行成员
-    supporter_members: List[UnitMember] = field(default_factory=list)  # 支持成员
+    # 执行 / 支持成员，按 agent_id 索引（保持加入顺序），查找和移除均为 O(1)
+    executor_members: Dict[str, UnitMember] = field(default_factory=dict)
+    supporter_members: Dict[str, UnitMember] = field(default_factory=dict)
     
     status: UnitStatus = UnitStatus.FORMING
     priority: int = 0               # 优先级 (0-10)
     
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    created_at: str = field(default_factory=_now_iso)
     started_at: Optional[str] = None
     completed_at: Optional[str] = None
     
     tasks: List[Dict[str, Any]] = field(default_factory=list)  # Unit 承接的任务
     
+    # to_dict() / to_info() 结果缓存：字段重新赋值或成员 / 任务列表变化时失效
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
+    _info_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
+    # 状态变化回调 (unit, old_status)：由 UnitManager 设置，用于更新状态索引并保存
+    _on_status_change: Optional[Callable[["AgentUnit", UnitStatus], None]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __setattr__(self, name, value):
+        if name == "status":
+            old_status = getattr(self, "status", None)
+            object.__setattr__(self, name, value)
+            self._invalidate()
+            callback = getattr(self, "_on_status_change", None)
+            if callback is not None and old_status is not None and old_status != value:
+                callback(self, old_status)
+            return
+        object.__setattr__(self, name, value)
+        if name not in ("_dict_cache", "_info_cache", "_on_status_change"):
+            self._invalidate()
+            if name in _MEMBER_FIELDS:
+                self._watch_members()
+    
+    def _watch_members(self):
+        """让所有成员的字段变化都会清除本 Unit 的缓存"""
+        # __init__ 逐个字段赋值时后面的成员字段可能尚未设置
+        invalidate = self._invalidate
+        lead = getattr(self, "lead_member", None)
+        if lead is not None:
+            lead._on_change = invalidate
+        for name in ("executor_members", "supporter_members"):
+            for member in (getattr(self, name, None) or {}).values():
+                member._on_change = invalidate
+    
+    def _invalidate(self):
+        """清除 to_dict() / to_info() 缓存"""
+        object.__setattr__(self, "_dict_cache", None)
+        object.__setattr__(self, "_info_cache", None)
+    
     def add_executor(self, member: UnitMember) -> bool:
         """添加执行成员"""
         if member.role != UnitRole.EXECUTOR:
             member.role = UnitRole.EXECUTOR
-        self.executor_members.append(member)
+        member._on_change = self._invalidate
+        self.executor_members[member.agent_id] = member
+        self._invalidate()
         return True
     
     def add_supporter(self, member: UnitMember) -> bool:
         """添加支持成员"""
         if member.role != UnitRole.SUPPORTER:
             member.role = UnitRole.SUPPORTER
-        self.supporter_members.append(member)
+        member._on_change = self._invalidate
+        self.supporter_members[member.agent_id] = member
+        self._invalidate()
         return True
     
+    def iter_members(self) -> Iterator[UnitMember]:
+        """依次遍历负责人、执行成员、支持成员（不构造新列表）"""
+        if self.lead_member:
+            yield self.lead_member
+        yield from self.executor_members.values()
+        yield from self.supporter_members.values()
+    
     def get_all_members(self) -> List[UnitMember]:
         """获取所有成员"""
-        members = []
-        if self.lead_member:
-            members.append(self.lead_member)
-        members.extend(self.executor_members)
-        members.extend(self.supporter_members)
-        return members
+        return list(self.iter_members())
     
     def remove_member(self, agent_id: str) -> bool:
         """移除成员"""
@@ -101,15 +199,17 @@ class AgentUnit:
             # 不能移除负责人
             return False
         
-        self.executor_members = [m for m in self.executor_members if m.agent_id != agent_id]
-        self.supporter_members = [m for m in self.supporter_members if m.agent_id != agent_id]
+        self.executor_members.pop(agent_id, None)
+        self.supporter_members.pop(agent_id, None)
+        self._invalidate()
         return True
     
     def activate(self) -> bool:
         """激活 Unit"""
         if self.status == UnitStatus.FORMING and self.lead_member:
+            # 先写时间戳再改状态：状态变化会触发管理器保存
+            self.started_at = _now_iso()
             self.status = UnitStatus.ACTIVE
-            self.started_at = datetime.now().isoformat()
             return True
         return False
     
@@ -130,48 +230,145 @@ class AgentUnit:
     def complete(self) -> bool:
         """完成 Unit"""
         if self.status in [UnitStatus.ACTIVE, UnitStatus.PAUSED]:
+            self.completed_at = _now_iso()
             self.status = UnitStatus.COMPLETED
-            self.completed_at = datetime.now().isoformat()
             return True
         return False
     
     def disband(self) -> bool:
         """解散 Unit"""
+        self.completed_at = _now_iso()
         self.status = UnitStatus.DISBANDED
-        self.completed_at = datetime.now().isoformat()
         return True
     
     def assign_task(self, task: Dict[str, Any]) -> bool:
         """分配任务给 Unit"""
         self.tasks.append(task)
+        self._invalidate()
         return True
     
     def get_member_count(self) -> Dict[str, int]:
         """获取成员数量"""
+        lead = 1 if self.lead_member else 0
+        executors = len(self.executor_members)
+        supporters = len(self.supporter_members)
         return {
-            "lead": 1 if self.lead_member else 0,
-            "executors": len(self.executor_members),
-            "supporters": len(self.supporter_members),
-            "total": len(self.get_all_members())
+            "lead": lead,
+            "executors": executors,
+            "supporters": supporters,
+            "total": lead + executors + supporters
         }
     
-    def to_dict(self) -> Dict:
+    def to_info(self) -> Dict:
+        """详细信息（供 OrganizationSystem.get_unit_info 使用，未修改时复用缓存）
+
+        返回缓存的副本，调用方修改结果不会影响缓存
+        """
+        if self._info_cache is None:
+            self._info_cache = self._build_info()
+        return _copy_info(self._info_cache)
+    
+    def _build_info(self) -> Dict:
+        """构造 to_info() 的缓存内容"""
         return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "project_id": self.project_id,
+            "status": self.status.value,
+            "priority": self.priority,
+            "lead": {
+                "agent_id": self.lead_member.agent_id,
+                "agent_name": self.lead_member.agent_name,
+                "department": self.lead_member.department_id,
+                "position": self.lead_member.position_name
+            } if self.lead_member else None,
+            "executors": [
+                {
+                    "agent_id": m.agent_id,
+                    "agent_name": m.agent_name,
+                    "department": m.department_id,
+                    "position": m.position_name,
+                    "responsibilities": m.responsibilities
+                }
+                for m in self.executor_members.values()
+            ],
+            "supporters": [
+                {
+                    "agent_id": m.agent_id,
+                    "agent_name": m.agent_name,
+                    "department": m.department_id,
+                    "position": m.position_name,
+                    "responsibilities": m.responsibilities
+                }
+                for m in self.supporter_members.values()
+            ],
+            "member_count": self.get_member_count(),
+            "tasks_count": len(self.tasks),
+            "created_at": self.created_at,
+            "started_at": self.started_at
+        }
+    
+    def to_dict(self) -> Dict:
+        """转换为字典（返回缓存的副本，调用方修改结果不会影响 Unit 或缓存）"""
+        return _copy_unit_dict(self._cached_dict())
+    
+    def _cached_dict(self) -> Dict:
+        """内部使用的字典（未修改时复用同一对象，调用方不得修改）"""
+        if self._dict_cache is not None:
+            return self._dict_cache
+        self._dict_cache = {
             "id": self.id,
             "name": self.name,
             "description": self.description,
             "project_id": self.project_id,
             "lead_member": self.lead_member.to_dict() if self.lead_member else None,
-            "executor_members": [m.to_dict() for m in self.executor_members],
-            "supporter_members": [m.to_dict() for m in self.supporter_members],
+            "executor_members": {k: m.to_dict() for k, m in self.executor_members.items()},
+            "supporter_members": {k: m.to_dict() for k, m in self.supporter_members.items()},
             "status": self.status.value,
             "priority": self.priority,
             "member_count": self.get_member_count(),
             "tasks_count": len(self.tasks),
+            "tasks": [dict(t) for t in self.tasks],
             "created_at": self.created_at,
             "started_at": self.started_at,
             "completed_at": self.completed_at
         }
+        return self._dict_cache
+
+
+def _copy_member_dict(member: Dict) -> Dict:
+    """复制 UnitMember.to_dict() 结果"""
+    out = dict(member)
+    out["skills"] = list(member["skills"])
+    return out
+
+
+def _copy_unit_dict(data: Dict) -> Dict:
+    """复制 AgentUnit 字典（成员、任务等嵌套结构也复制）"""
+    out = dict(data)
+    if data["lead_member"] is not None:
+        out["lead_member"] = _copy_member_dict(data["lead_member"])
+    out["executor_members"] = {k: _copy_member_dict(m) for k, m in data["executor_members"].items()}
+    out["supporter_members"] = {k: _copy_member_dict(m) for k, m in data["supporter_members"].items()}
+    out["member_count"] = dict(data["member_count"])
+    out["tasks"] = [dict(t) for t in data["tasks"]]
+    return out
+
+
+def _copy_info(info: Dict) -> Dict:
+    """复制 to_info() 结果（嵌套的成员字典 / 列表也复制，值均为标量）"""
+    out = dict(info)
+    if info["lead"] is not None:
+        out["lead"] = dict(info["lead"])
+    out["executors"] = [dict(m) for m in info["executors"]]
+    out["supporters"] = [dict(m) for m in info["supporters"]]
+    out["member_count"] = dict(info["member_count"])
+    return out
+
+
+# msgspec 直接将 JSON 解码为 dataclass（枚举按值还原），免去中间 dict 和逐字段构造
+_UNITS_DECODER = msgspec.json.Decoder(Dict[str, AgentUnit]) if msgspec is not None else None
 
 
 class UnitManager:
@@ -180,6 +377,14 @@ class UnitManager:
     def __init__(self, storage_file: str = "/Users/viosson/units_config.json"):
         self.storage_file = storage_file
         self.units: Dict[str, AgentUnit] = {}
+        # 状态 / 项目 -> {unit_id} 索引，按条件列出 Unit 时无需遍历全部
+        self._by_status: Dict[UnitStatus, Set[str]] = {}
+        self._by_project: Dict[Optional[str], Set[str]] = {}
+        self._unit_seq: Dict[str, int] = {}  # 创建顺序，保证列出结果顺序稳定
+        self._seq_counter = itertools.count()
+        self._dirty = False     # 是否有未保存的修改
+        self._autosave = True   # False 时（batch 期间）修改只标记，不立即写盘
+        self.version = 0        # 每次修改递增，供上层判断缓存的统计是否过期
         self.load_units()
     
     def create_unit(
@@ -193,7 +398,7 @@ class UnitManager:
     ) -> Optional[AgentUnit]:
         """创建 Unit"""
         if unit_id in self.units:
-            print(f"⚠️ Unit {unit_id} 已存在")
+            logger.warning("⚠️ Unit %s 已存在", unit_id)
             return None
         
         unit = AgentUnit(
@@ -205,9 +410,9 @@ class UnitManager:
             priority=priority
         )
         
-        self.units[unit_id] = unit
-        self.save_units()
-        print(f"✓ Unit '{name}' 创建成功 (负责人: {lead_member.agent_name})")
+        self._add_unit(unit_id, unit)
+        self._mark_dirty()
+        logger.info("✓ Unit '%s' 创建成功 (负责人: %s)", name, lead_member.agent_name)
         return unit
     
     def get_unit(self, unit_id: str) -> Optional[AgentUnit]:
@@ -220,11 +425,11 @@ class UnitManager:
     
     def list_units_by_status(self, status: UnitStatus) -> List[AgentUnit]:
         """按状态列出 Unit"""
-        return [u for u in self.units.values() if u.status == status]
+        return self._units_in_order(self._by_status.get(status, ()))
     
     def list_units_by_project(self, project_id: str) -> List[AgentUnit]:
         """按项目列出 Unit"""
-        return [u for u in self.units.values() if u.project_id == project_id]
+        return self._units_in_order(self._by_project.get(project_id, ()))
     
     def add_member_to_unit(
         self,
@@ -236,7 +441,15 @@ class UnitManager:
         unit = self.get_unit(unit_id)
         if not unit:
             return False
-        
+        return self.add_member_to_unit_obj(unit, member, role)
+    
+    def add_member_to_unit_obj(
+        self,
+        unit: AgentUnit,
+        member: UnitMember,
+        role: UnitRole
+    ) -> bool:
+        """添加成员到已取得的 Unit 对象（调用方已查到 Unit 时免去再次查找）"""
         member.role = role
         
         if role == UnitRole.EXECUTOR:
@@ -244,8 +457,8 @@ class UnitManager:
         elif role == UnitRole.SUPPORTER:
             unit.add_supporter(member)
         
-        self.save_units()
-        print(f"✓ Agent '{member.agent_name}' 已添加到 Unit '{unit.name}' (角色: {role.value})")
+        self._mark_dirty()
+        logger.info("✓ Agent '%s' 已添加到 Unit '%s' (角色: %s)", member.agent_name, unit.name, role.value)
         return True
     
     def remove_member_from_unit(self, unit_id: str, agent_id: str) -> bool:
@@ -256,8 +469,8 @@ class UnitManager:
         
         result = unit.remove_member(agent_id)
         if result:
-            self.save_units()
-            print(f"✓ 成员已从 Unit '{unit.name}' 移除")
+            self._mark_dirty()
+            logger.info("✓ 成员已从 Unit '%s' 移除", unit.name)
         return result
     
     def activate_unit(self, unit_id: str) -> bool:
@@ -266,10 +479,10 @@ class UnitManager:
         if not unit:
             return False
         
+        # 状态索引和保存由 _on_unit_status_change 处理
         result = unit.activate()
         if result:
-            self.save_units()
-            print(f"✓ Unit '{unit.name}' 已激活 (成员: {unit.get_member_count()['total']})")
+            logger.info("✓ Unit '%s' 已激活 (成员: %d)", unit.name, unit.get_member_count()['total'])
         return result
     
     def complete_unit(self, unit_id: str) -> bool:
@@ -280,8 +493,29 @@ class UnitManager:
         
         result = unit.complete()
         if result:
-            self.save_units()
-            print(f"✓ Unit '{unit.name}' 已完成")
+            logger.info("✓ Unit '%s' 已完成", unit.name)
+        return result
+    
+    def pause_unit(self, unit_id: str) -> bool:
+        """暂停 Unit"""
+        unit = self.get_unit(unit_id)
+        if not unit:
+            return False
+        
+        result = unit.pause()
+        if result:
+            logger.info("✓ Unit '%s' 已暂停", unit.name)
+        return result
+    
+    def resume_unit(self, unit_id: str) -> bool:
+        """恢复 Unit"""
+        unit = self.get_unit(unit_id)
+        if not unit:
+            return False
+        
+        result = unit.resume()
+        if result:
+            logger.info("✓ Unit '%s' 已恢复", unit.name)
         return result
     
     def disband_unit(self, unit_id: str) -> bool:
@@ -290,10 +524,12 @@ class UnitManager:
         if not unit:
             return False
         
+        old_status = unit.status
         result = unit.disband()
         if result:
-            self.save_units()
-            print(f"✓ Unit '{unit.name}' 已解散")
+            if old_status == UnitStatus.DISBANDED:
+                self._mark_dirty()  # 状态未变化时回调不会触发，但 completed_at 已更新
+            logger.info("✓ Unit '%s' 已解散", unit.name)
         return result
     
     def assign_task_to_unit(
@@ -314,33 +550,35 @@ class UnitManager:
             "task_name": task_name,
             "description": description,
             "priority": priority,
-            "assigned_at": datetime.now().isoformat(),
+            "assigned_at": _now_iso(),
             "status": "assigned"
         }
         
         unit.assign_task(task)
-        self.save_units()
-        print(f"✓ 任务 '{task_name}' 已分配给 Unit '{unit.name}'")
+        self._mark_dirty()
+        logger.info("✓ 任务 '%s' 已分配给 Unit '%s'", task_name, unit.name)
         return True
     
     def get_statistics(self) -> Dict[str, Any]:
         """获取统计信息"""
-        active_units = [u for u in self.units.values() if u.status == UnitStatus.ACTIVE]
-        completed_units = [u for u in self.units.values() if u.status == UnitStatus.COMPLETED]
+        units_by_status = {
+            status.value: len(self._by_status.get(status, ()))
+            for status in UnitStatus
+        }
         
-        total_members = sum(len(u.get_all_members()) for u in self.units.values())
+        total_members = sum(
+            (1 if u.lead_member else 0) + len(u.executor_members) + len(u.supporter_members)
+            for u in self.units.values()
+        )
         total_tasks = sum(len(u.tasks) for u in self.units.values())
         
         return {
             "total_units": len(self.units),
-            "active_units": len(active_units),
-            "completed_units": len(completed_units),
+            "active_units": units_by_status[UnitStatus.ACTIVE.value],
+            "completed_units": units_by_status[UnitStatus.COMPLETED.value],
             "total_members": total_members,
             "total_tasks": total_tasks,
-            "units_by_status": {
-                status.value: len([u for u in self.units.values() if u.status == status])
-                for status in UnitStatus
-            }
+            "units_by_status": units_by_status
         }
     
     def search_units(
@@ -350,100 +588,155 @@ class UnitManager:
         project_id: Optional[str] = None
     ) -> List[AgentUnit]:
         """搜索 Unit"""
-        results = list(self.units.values())
-        
-        if name:
-            results = [u for u in results if name.lower() in u.name.lower()]
+        candidates: Optional[Set[str]] = None
         
         if status:
-            results = [u for u in results if u.status == status]
+            candidates = set(self._by_status.get(status, ()))
         
         if project_id:
-            results = [u for u in results if u.project_id == project_id]
+            project_ids = self._by_project.get(project_id, set())
+            candidates = set(project_ids) if candidates is None else candidates & project_ids
+        
+        results = list(self.units.values()) if candidates is None else self._units_in_order(candidates)
+        
+        if name:
+            name = name.lower()
+            results = [u for u in results if name in u.name.lower()]
         
         return results
     
+    def _add_unit(self, unit_id: str, unit: AgentUnit):
+        """登记 Unit 并写入状态 / 项目索引"""
+        self.units[unit_id] = unit
+        self._unit_seq[unit_id] = next(self._seq_counter)
+        self._by_status.setdefault(unit.status, set()).add(unit_id)
+        self._by_project.setdefault(unit.project_id, set()).add(unit_id)
+        unit._watch_members()  # msgspec 解码得到的 Unit 不经过 __setattr__，在此补上成员回调
+        # 无论通过管理器还是直接调用 unit.pause() 等方法改状态，索引都会同步更新
+        unit._on_status_change = partial(self._on_unit_status_change, unit_id)
+    
+    def _on_unit_status_change(self, unit_id: str, unit: AgentUnit, old_status: UnitStatus):
+        """Unit 状态变化回调：更新状态索引并标记修改"""
+        self._reindex_status(unit_id, old_status)
+        self._mark_dirty()
+    
+    def _reindex_status(self, unit_id: str, old_status: UnitStatus):
+        """Unit 状态变化后更新状态索引"""
+        new_status = self.units[unit_id].status
+        if new_status != old_status:
+            self._by_status.get(old_status, set()).discard(unit_id)
+            self._by_status.setdefault(new_status, set()).add(unit_id)
+    
+    def _units_in_order(self, unit_ids) -> List[AgentUnit]:
+        """按创建顺序返回 unit_ids 对应的 Unit"""
+        return [self.units[i] for i in sorted(unit_ids, key=self._unit_seq.__getitem__)]
+    
+    def _mark_dirty(self):
+        """标记有未保存的修改，非批量模式下立即保存"""
+        self._dirty = True
+        self.version += 1
+        if self._autosave:
+            self.flush()
+    
+    def flush(self):
+        """有未保存的修改时写盘"""
+        if self._dirty:
+            self._dirty = False
+            self.save_units()
+    
+    @contextmanager
+    def batch(self):
+        """批量修改期间暂停自动保存，结束时统一写盘一次"""
+        prev = self._autosave
+        self._autosave = False
+        try:
+            yield self
+        finally:
+            self._autosave = prev
+            self.flush()
+    
     def save_units(self):
         """保存 Unit 配置"""
         data = {
-            unit_id: unit.to_dict()
+            unit_id: unit._cached_dict()
             for unit_id, unit in self.units.items()
         }
         try:
-            with open(self.storage_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+            # 写临时文件后原子替换，崩溃时不会损坏已有配置
+            tmp_path = self.storage_file + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, self.storage_file)
         except Exception as e:
-            print(f"❌ 保存 Unit 配置失败: {e}")
+            logger.error("❌ 保存 Unit 配置失败: %s", e)
     
     def load_units(self):
         """加载 Unit 配置"""
         try:
-            with open(self.storage_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(self.storage_file, 'rb') as f:
+                raw = f.read()
+            if _UNITS_DECODER is not None:
+                try:
+                    units = _UNITS_DECODER.decode(raw)
+                except msgspec.ValidationError:
+                    pass  # 成员仍以列表保存的旧数据，走下面的逐条解析
+                else:
+                    for unit_id, unit in units.items():
+                        self._add_unit(unit_id, unit)
+                    return
+            
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            members_from_data = self._members_from_data
             
             for unit_id, unit_data in data.items():
-                # 恢复负责人
                 lead_data = unit_data.get("lead_member")
-                lead_member = None
-                if lead_data:
-                    lead_member = UnitMember(
-                        agent_id=lead_data["agent_id"],
-                        agent_name=lead_data["agent_name"],
-                        role=UnitRole(lead_data["role"]),
-                        department_id=lead_data["department_id"],
-                        position_name=lead_data["position_name"],
-                        skills=lead_data["skills"],
-                        responsibilities=lead_data["responsibilities"],
-                        added_at=lead_data["added_at"]
-                    )
-                
-                # 恢复成员
-                executor_members = [
-                    UnitMember(
-                        agent_id=m["agent_id"],
-                        agent_name=m["agent_name"],
-                        role=UnitRole(m["role"]),
-                        department_id=m["department_id"],
-                        position_name=m["position_name"],
-                        skills=m["skills"],
-                        responsibilities=m["responsibilities"],
-                        added_at=m["added_at"]
-                    )
-                    for m in unit_data.get("executor_members", [])
-                ]
-                
-                supporter_members = [
-                    UnitMember(
-                        agent_id=m["agent_id"],
-                        agent_name=m["agent_name"],
-                        role=UnitRole(m["role"]),
-                        department_id=m["department_id"],
-                        position_name=m["position_name"],
-                        skills=m["skills"],
-                        responsibilities=m["responsibilities"],
-                        added_at=m["added_at"]
-                    )
-                    for m in unit_data.get("supporter_members", [])
-                ]
-                
                 unit = AgentUnit(
                     id=unit_data["id"],
                     name=unit_data["name"],
                     description=unit_data["description"],
                     project_id=unit_data.get("project_id"),
-                    lead_member=lead_member,
-                    executor_members=executor_members,
-                    supporter_members=supporter_members,
-                    status=UnitStatus(unit_data["status"]),
+                    lead_member=self._member_from_dict(lead_data) if lead_data else None,
+                    executor_members=members_from_data(unit_data.get("executor_members")),
+                    supporter_members=members_from_data(unit_data.get("supporter_members")),
+                    status=_UNIT_STATUS_BY_VALUE[unit_data["status"]],
                     priority=unit_data.get("priority", 0),
                     created_at=unit_data["created_at"],
                     started_at=unit_data.get("started_at"),
-                    completed_at=unit_data.get("completed_at")
+                    completed_at=unit_data.get("completed_at"),
+                    tasks=unit_data.get("tasks", [])
                 )
                 
-                self.units[unit_id] = unit
+                self._add_unit(unit_id, unit)
         
         except FileNotFoundError:
             pass
         except Exception as e:
-            print(f"⚠️ 加载 Unit 配置失败: {e}")
+            logger.warning("⚠️ 加载 Unit 配置失败: %s", e)
+    
+    @staticmethod
+    def _member_from_dict(m: Dict[str, Any]) -> UnitMember:
+        """由 JSON 数据恢复 Unit 成员（skills / responsibilities 缺失时取默认值）"""
+        # 按字段顺序位置传参: agent_id, agent_name, role, department_id,
+        # position_name, skills, responsibilities, added_at
+        return UnitMember(
+            m["agent_id"],
+            m["agent_name"],
+            _UNIT_ROLE_BY_VALUE[m["role"]],
+            m["department_id"],
+            m["position_name"],
+            m.get("skills") or [],
+            m.get("responsibilities", ""),
+            m["added_at"]
+        )
+    
+    @classmethod
+    def _members_from_data(cls, data) -> Dict[str, UnitMember]:
+        """恢复成员表：兼容按 agent_id 保存的字典和旧版列表两种格式"""
+        if not data:
+            return {}
+        items = data.values() if isinstance(data, dict) else data
+        return {m["agent_id"]: cls._member_from_dict(m) for m in items}
@@ -2,6 +2,7 @@
 import os
 import sys
 import json
+import logging
 import argparse
 from datetime import datetime
 from pathlib import Path
@@ -9,17 +10,23 @@ from pathlib import Path
 sys.path.insert(0, '/Users/viosson')
 
 from agent_system import AgentEmployeeSystem, setup_default_agents
-from agent_orchestrator import AgentOrchestrator
-from langfuse_pm_agent import LangfuseProjectManagerAgent
+# AgentOrchestrator / LangfuseProjectManagerAgent 在用到时才导入，help 等命令无需加载
 
 class DevOllenAgentManager:
     def __init__(self):
         self.system = AgentEmployeeSystem()
-        self.orchestrator = AgentOrchestrator()
+        self._orchestrator = None
         self.agents = {}
         self.config_file = Path("/Users/viosson/agent_manager_config.json")
         self.load_config()
     
+    @property
+    def orchestrator(self):
+        if self._orchestrator is None:
+            from agent_orchestrator import AgentOrchestrator
+            self._orchestrator = AgentOrchestrator()
+        return self._orchestrator
+    
     def load_config(self):
         if self.config_file.exists():
             with open(self.config_file) as f:
@@ -40,6 +47,7 @@ class DevOllenAgentManager:
     def initialize(self):
         print("\nInitializing DEVOLLEN Agent System...")
         setup_default_agents()
+        from langfuse_pm_agent import LangfuseProjectManagerAgent
         pm_agent = LangfuseProjectManagerAgent()
         self.agents["pm"] = pm_agent
         self.orchestrator.register_agent("langfuse_pm_001", pm_agent)
@@ -190,6 +198,7 @@ def main():
         print("Type 'help' to see available commands")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     try:
         main()
     except KeyboardInterrupt:
@@ -1,21 +1,137 @@
+import asyncio
+import functools
 import os
 import json
+import logging
+import threading
+import time
 import requests
-from typing import Any, Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 
-from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
+try:
+    import orjson
+except ImportError:  # fall back to stdlib json when orjson is not installed
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # without ijson list responses are parsed with response.json()
+    ijson = None
+
+try:
+    from prometheus_client import Counter, Histogram, start_http_server
+except ImportError:  # metrics are simply not recorded without prometheus_client
+    Counter = Histogram = start_http_server = None
+
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
-from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
 
 # ============= Configuration =============
 LANGFUSE_API_URL = os.getenv("LANGFUSE_API_URL", "http://localhost:3000")
 LANGFUSE_API_KEY = os.getenv("LANGFUSE_API_KEY", "demo-pk-123456")
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY", "demo-sk-123456")
+LANGFUSE_MAX_CONCURRENCY = int(os.getenv("LANGFUSE_MAX_CONCURRENCY", "8"))  # concurrent reports in a batch
+LANGFUSE_DEFAULT_PROJECT_TTL = float(os.getenv("LANGFUSE_DEFAULT_PROJECT_TTL", "3600"))  # seconds
+
+# Shared HTTP session: keep-alive connection pool and credentials reused by every tool call
+_SESSION = requests.Session()
+_SESSION.auth = (LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY)
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    # Up to 3 attempts on connection errors, read timeouts and 502/503/504,
+    # with exponential backoff (backoff_factor 0.1)
+    max_retries=Retry(
+        total=2,
+        connect=2,
+        read=2,
+        backoff_factor=0.1,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False
+    )
+)
+# (connect, read) seconds: a slow endpoint fails fast instead of holding a report for 10s per call
+HTTP_TIMEOUT = (2, 5)
+_SESSION.mount("http://", _HTTP_ADAPTER)
+_SESSION.mount("https://", _HTTP_ADAPTER)
+
+# Background pool for stale-while-revalidate cache refreshes
+_BACKGROUND_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="langfuse-refresh")
+
+# ============= Response Cache =============
+# (url, params) -> [payload, etag, last_modified, expires_at]
+_RESPONSE_CACHE: Dict[tuple, list] = {}
+_CACHE_LOCK = threading.Lock()
+_REFRESHING: set = set()  # keys with a background revalidation in flight
+
+PROJECTS_CACHE_TTL = 300  # seconds
+STATS_CACHE_TTL = 30
+
+def _fetch(key: tuple, url: str, params: Optional[Dict[str, Any]], ttl: float) -> Any:
+    """GET url and store the payload; sends the cached validators so an unchanged resource comes back as 304."""
+    with _CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+    headers = {}
+    if entry is not None:
+        if entry[1]:
+            headers["If-None-Match"] = entry[1]
+        if entry[2]:
+            headers["If-Modified-Since"] = entry[2]
+    
+    response = _SESSION.get(url, params=params, headers=headers, timeout=HTTP_TIMEOUT)
+    if response.status_code == 304 and entry is not None:
+        payload = entry[0]
+    else:
+        response.raise_for_status()
+        payload = response.json().get("data")
+    
+    with _CACHE_LOCK:
+        _RESPONSE_CACHE[key] = [
+            payload,
+            response.headers.get("ETag") or (entry[1] if entry else None),
+            response.headers.get("Last-Modified") or (entry[2] if entry else None),
+            time.monotonic() + ttl
+        ]
+    return payload
+
+def _revalidate(key: tuple, url: str, params: Optional[Dict[str, Any]], ttl: float):
+    try:
+        _fetch(key, url, params, ttl)
+    except Exception as e:
+        # Keep serving the stale payload until the staleness cap; the next call retries
+        logger.warning("Background refresh of %s failed: %s", url, e)
+    finally:
+        with _CACHE_LOCK:
+            _REFRESHING.discard(key)
+
+def _cached_get(url: str, ttl: float, params: Optional[Dict[str, Any]] = None) -> Any:
+    """Return the response "data" for url, cached for ttl seconds.
+    
+    Once expired the stale payload is returned immediately and refreshed in the background.
+    A payload more than another ttl past expiry is never served: the call refetches
+    synchronously and lets a failure propagate.
+    """
+    key = (url, tuple(sorted(params.items())) if params else ())
+    with _CACHE_LOCK:
+        entry = _RESPONSE_CACHE.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry[3]:
+                return entry[0]
+            if now < entry[3] + ttl:
+                if key not in _REFRESHING:
+                    _REFRESHING.add(key)
+                    _BACKGROUND_EXECUTOR.submit(_revalidate, key, url, params, ttl)
+                return entry[0]
+    return _fetch(key, url, params, ttl)
 
 # ============= Data Models =============
 class TaskType(Enum):
@@ -25,8 +141,12 @@ class TaskType(Enum):
     TRACE_ANALYSIS = "trace_analysis"
     HEALTH_CHECK = "health_check"
 
-@dataclass
-class AgentState(BaseModel):
+# value -> member; task types arriving as strings are resolved once at the entry point
+_TASK_TYPE_BY_VALUE: Dict[str, TaskType] = {e.value: e for e in TaskType}
+
+# Shape of the workflow state; the graph itself passes a plain dict (StateGraph(dict))
+@dataclass(slots=True)
+class AgentState:
     task_id: str
     task_type: TaskType
     project_id: Optional[str] = None
@@ -34,83 +154,137 @@ class AgentState(BaseModel):
     result: Dict[str, Any] = field(default_factory=dict)
     status: str = "pending"
     messages: List[BaseMessage] = field(default_factory=list)
-    
-    class Config:
-        arbitrary_types_allowed = True
+    started_at: Optional[datetime] = None
 
 # ============= Langfuse API Tools =============
+def _get_data_list(url: str, params: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """GET a list endpoint and return its "data" array.
+    
+    With ijson the array items are parsed straight off the socket, so the raw body
+    is never held in memory as a whole. Raises requests.HTTPError on a non-2xx status.
+    """
+    if ijson is None:
+        response = _SESSION.get(url, params=params, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return response.json().get("data", [])
+    
+    with _SESSION.get(url, params=params, timeout=HTTP_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True  # let urllib3 undo gzip / deflate
+        return list(ijson.items(response.raw, "data.item", use_float=True))
+
+# ============= Tool Metrics =============
+if Histogram is not None:
+    _TOOL_LATENCY = Histogram("langfuse_tool_latency_seconds", "Langfuse tool call latency", ["tool"])
+    _TOOL_ERRORS = Counter("langfuse_tool_errors_total", "Langfuse tool calls that returned an error", ["tool"])
+
+def _instrumented(fn: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+    """Record latency and error count of a tool in the process-wide Prometheus registry."""
+    if Histogram is None:
+        return fn
+    # Bind the labelled children once so a call only observes / increments
+    latency = _TOOL_LATENCY.labels(fn.__name__)
+    errors = _TOOL_ERRORS.labels(fn.__name__)
+    
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            errors.inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - start)
+        if result.get("status") == "error":
+            errors.inc()
+        return result
+    
+    return wrapper
+
+def start_metrics_server(port: int) -> bool:
+    """Expose /metrics on the given port; returns False when prometheus_client is not installed."""
+    if start_http_server is None:
+        return False
+    start_http_server(port)
+    return True
+
+@functools.lru_cache(maxsize=32)
+def _since_iso_at(hours: int, second: int) -> str:
+    return (datetime.now() - timedelta(hours=hours)).isoformat()
+
+def _since_iso(hours: int) -> str:
+    """ISO timestamp `hours` ago, recomputed at most once per second."""
+    return _since_iso_at(hours, int(time.time()))
+
 @tool
+@_instrumented
 def get_projects() -> Dict[str, Any]:
+    """List all Langfuse projects."""
     try:
-        response = requests.get(
-            f"{LANGFUSE_API_URL}/api/projects",
-            auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
-            timeout=10
-        )
-        response.raise_for_status()
-        return {"status": "success", "projects": response.json().get("data", [])}
+        projects = _cached_get(f"{LANGFUSE_API_URL}/api/projects", PROJECTS_CACHE_TTL)
+        return {"status": "success", "projects": projects if projects is not None else []}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
 @tool
+@_instrumented
 def get_project_stats(project_id: str) -> Dict[str, Any]:
+    """Aggregate statistics for a project."""
     try:
-        response = requests.get(
-            f"{LANGFUSE_API_URL}/api/projects/{project_id}/stats",
-            auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
-            timeout=10
-        )
-        response.raise_for_status()
-        return {"status": "success", "stats": response.json().get("data", {})}
+        stats = _cached_get(f"{LANGFUSE_API_URL}/api/projects/{project_id}/stats", STATS_CACHE_TTL)
+        return {"status": "success", "stats": stats if stats is not None else {}}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
 @tool
+@_instrumented
 def get_recent_traces(project_id: str, limit: int = 10) -> Dict[str, Any]:
+    """Most recent traces of a project, at most `limit`."""
     try:
-        response = requests.get(
+        traces = _get_data_list(
             f"{LANGFUSE_API_URL}/api/projects/{project_id}/traces",
-            params={"limit": limit},
-            auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
-            timeout=10
+            params={"limit": limit}
         )
-        response.raise_for_status()
-        return {"status": "success", "traces": response.json().get("data", [])}
+        return {"status": "success", "traces": traces}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
 @tool
+@_instrumented
 def get_recent_errors(project_id: str, hours: int = 24) -> Dict[str, Any]:
+    """Errors recorded for a project in the last `hours` hours."""
     try:
-        since = (datetime.now() - timedelta(hours=hours)).isoformat()
-        response = requests.get(
+        errors = _get_data_list(
             f"{LANGFUSE_API_URL}/api/projects/{project_id}/errors",
-            params={"since": since},
-            auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
-            timeout=10
+            params={"since": _since_iso(hours)}
         )
-        response.raise_for_status()
-        return {"status": "success", "errors": response.json().get("data", [])}
+        return {"status": "success", "errors": errors}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
 @tool
-def check_project_health(project_id: str) -> Dict[str, Any]:
+@_instrumented
+def check_project_health(project_id: str, error_hours: Optional[int] = None) -> Dict[str, Any]:
+    """Health summary plus the raw stats / errors it was computed from.
+    
+    error_hours limits the error query to the last N hours (all errors when None).
+    """
     try:
-        stats_response = requests.get(
-            f"{LANGFUSE_API_URL}/api/projects/{project_id}/stats",
-            auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
-            timeout=10
-        )
-        stats_response.raise_for_status()
-        stats = stats_response.json().get("data", {})
+        stats = _cached_get(f"{LANGFUSE_API_URL}/api/projects/{project_id}/stats", STATS_CACHE_TTL)
+        if stats is None:
+            stats = {}
         
-        errors_response = requests.get(
-            f"{LANGFUSE_API_URL}/api/projects/{project_id}/errors",
-            auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
-            timeout=10
-        )
-        errors = errors_response.json().get("data", []) if errors_response.ok else []
+        errors_params = None
+        if error_hours is not None:
+            errors_params = {"since": _since_iso(error_hours)}
+        try:
+            errors = _get_data_list(
+                f"{LANGFUSE_API_URL}/api/projects/{project_id}/errors",
+                params=errors_params
+            )
+        except requests.HTTPError:
+            errors = []  # an unavailable errors endpoint does not fail the health check
         
         health_status = "healthy"
         alerts = []
@@ -126,113 +300,153 @@ def check_project_health(project_id: str) -> Dict[str, Any]:
                 "alerts": alerts,
                 "stats": stats,
                 "error_count": len(errors)
-            }
+            },
+            "errors": errors
         }
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
 # ============= Workflow Nodes =============
-def analyze_task_node(state: Dict[str, Any]) -> Dict[str, Any]:
+# Project used when a task names none (first in the project list), cached per process
+_DEFAULT_PROJECT_ID: Optional[str] = None
+_DEFAULT_PROJECT_EXPIRES = 0.0
+_DEFAULT_PROJECT_LOCK = threading.Lock()
+
+def _get_default_project_id() -> Optional[str]:
+    """First project's id, looked up at most once per LANGFUSE_DEFAULT_PROJECT_TTL; None if there is none."""
+    global _DEFAULT_PROJECT_ID, _DEFAULT_PROJECT_EXPIRES
+    if _DEFAULT_PROJECT_ID is not None and time.monotonic() < _DEFAULT_PROJECT_EXPIRES:
+        return _DEFAULT_PROJECT_ID
+    with _DEFAULT_PROJECT_LOCK:
+        if _DEFAULT_PROJECT_ID is not None and time.monotonic() < _DEFAULT_PROJECT_EXPIRES:
+            return _DEFAULT_PROJECT_ID
+        projects_result = get_projects.invoke({})
+        if projects_result.get("status") != "success":
+            return None
+        projects = projects_result.get("projects", [])
+        if not projects:
+            return None
+        _DEFAULT_PROJECT_ID = projects[0].get("id")
+        _DEFAULT_PROJECT_EXPIRES = time.monotonic() + LANGFUSE_DEFAULT_PROJECT_TTL
+        return _DEFAULT_PROJECT_ID
+
+async def analyze_task_node(state: Dict[str, Any]) -> Dict[str, Any]:
     task_type = state.get("task_type")
     project_id = state.get("project_id")
     
-    print(f"\nAnalyzing: {task_type}")
+    logger.info("\nAnalyzing: %s", task_type.value, extra={"task_type": task_type.value})
     state["status"] = "analyzing"
-    state["action"] = f"Analyzing {task_type} task"
+    state["action"] = f"Analyzing {task_type.value} task"
     
     if not project_id:
         try:
-            projects_result = get_projects.invoke({})
-            if projects_result.get("status") == "success":
-                projects = projects_result.get("projects", [])
-                if projects:
-                    state["project_id"] = projects[0].get("id")
+            default_id = await asyncio.to_thread(_get_default_project_id)
+            if default_id:
+                state["project_id"] = default_id
         except Exception as e:
             state["project_id"] = "demo-project"
     
     return state
 
-def execute_action_node(state: Dict[str, Any]) -> Dict[str, Any]:
-    task_type = state.get("task_type")
-    project_id = state.get("project_id") or "demo-project"
+async def _handle_daily_report(project_id: str) -> Tuple[Dict[str, Any], str]:
+    # The health check already fetches /stats and the last 24h of /errors;
+    # reuse them instead of calling get_project_stats / get_recent_errors again.
+    # The two remaining calls are independent, so await them concurrently.
+    health, traces = await asyncio.gather(
+        check_project_health.ainvoke({"project_id": project_id, "error_hours": 24}),
+        get_recent_traces.ainvoke({"project_id": project_id, "limit": 5}),
+        return_exceptions=True
+    )
     
-    state["status"] = "executing"
+    result = {}
+    if isinstance(health, BaseException):
+        result["health"] = {"status": "unknown", "error": str(health)}
+        result["stats"] = {}
+        result["recent_errors"] = []
+    else:
+        result["health"] = health.get("health", {})
+        result["stats"] = result["health"].get("stats", {})
+        result["recent_errors"] = health.get("errors", [])
     
-    if task_type == TaskType.DAILY_REPORT.value:
-        result = {}
-        try:
-            health = check_project_health.invoke({"project_id": project_id})
-            result["health"] = health.get("health", {})
-        except Exception as e:
-            result["health"] = {"status": "unknown", "error": str(e)}
-        
-        try:
-            stats = get_project_stats.invoke({"project_id": project_id})
-            result["stats"] = stats.get("stats", {})
-        except Exception as e:
-            result["stats"] = {}
-        
-        try:
-            traces = get_recent_traces.invoke({"project_id": project_id, "limit": 5})
-            result["recent_traces"] = traces.get("traces", [])
-        except Exception as e:
-            result["recent_traces"] = []
-        
-        try:
-            errors = get_recent_errors.invoke({"project_id": project_id, "hours": 24})
-            result["recent_errors"] = errors.get("errors", [])
-        except Exception as e:
-            result["recent_errors"] = []
-        
-        state["result"] = result
-        state["action"] = "Daily report generated"
+    if isinstance(traces, BaseException):
+        result["recent_traces"] = []
+    else:
+        result["recent_traces"] = traces.get("traces", [])
     
-    elif task_type == TaskType.ERROR_ANALYSIS.value:
-        try:
-            errors = get_recent_errors.invoke({"project_id": project_id, "hours": 24})
-            state["result"] = {"errors": errors.get("errors", []), "error_count": len(errors.get("errors", []))}
-        except Exception as e:
-            state["result"] = {"errors": [], "error_count": 0, "error": str(e)}
-        state["action"] = "Error analysis completed"
+    return result, "Daily report generated"
+
+async def _handle_error_analysis(project_id: str) -> Tuple[Dict[str, Any], str]:
+    try:
+        errors = await get_recent_errors.ainvoke({"project_id": project_id, "hours": 24})
+        result = {"errors": errors.get("errors", []), "error_count": len(errors.get("errors", []))}
+    except Exception as e:
+        result = {"errors": [], "error_count": 0, "error": str(e)}
+    return result, "Error analysis completed"
+
+async def _handle_performance_analysis(project_id: str) -> Tuple[Dict[str, Any], str]:
+    try:
+        stats = await get_project_stats.ainvoke({"project_id": project_id})
+        result = stats.get("stats", {})
+    except Exception as e:
+        result = {"error": str(e)}
+    return result, "Performance analysis completed"
+
+async def _handle_health_check(project_id: str) -> Tuple[Dict[str, Any], str]:
+    try:
+        health = await check_project_health.ainvoke({"project_id": project_id})
+        result = health.get("health", {})
+    except Exception as e:
+        result = {"status": "error", "error": str(e)}
+    return result, "Health check completed"
+
+# task type -> async handler(project_id) returning (result, action)
+HANDLERS: Dict[TaskType, Callable[[str], Awaitable[Tuple[Dict[str, Any], str]]]] = {
+    TaskType.DAILY_REPORT: _handle_daily_report,
+    TaskType.ERROR_ANALYSIS: _handle_error_analysis,
+    TaskType.PERFORMANCE_ANALYSIS: _handle_performance_analysis,
+    TaskType.HEALTH_CHECK: _handle_health_check,
+}
+
+async def execute_action_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    project_id = state.get("project_id") or "demo-project"
     
-    elif task_type == TaskType.PERFORMANCE_ANALYSIS.value:
-        try:
-            stats = get_project_stats.invoke({"project_id": project_id})
-            state["result"] = stats.get("stats", {})
-        except Exception as e:
-            state["result"] = {"error": str(e)}
-        state["action"] = "Performance analysis completed"
+    state["status"] = "executing"
     
-    elif task_type == TaskType.HEALTH_CHECK.value:
-        try:
-            health = check_project_health.invoke({"project_id": project_id})
-            state["result"] = health.get("health", {})
-        except Exception as e:
-            state["result"] = {"status": "error", "error": str(e)}
-        state["action"] = "Health check completed"
+    # Unsupported task types (e.g. trace_analysis) leave result / action untouched
+    handler = HANDLERS.get(state.get("task_type"))
+    if handler is not None:
+        state["result"], state["action"] = await handler(project_id)
     
     return state
 
-def generate_report_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def generate_report_node(state: Dict[str, Any]) -> Dict[str, Any]:
     state["status"] = "completed"
     
     report = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": state["started_at"].isoformat(),
         "task_id": state.get("task_id"),
-        "task_type": state.get("task_type"),
+        "task_type": state["task_type"].value,
         "project_id": state.get("project_id"),
         "action": state.get("action"),
         "result": state.get("result"),
         "status": state.get("status")
     }
     
-    message = AIMessage(content=json.dumps(report, indent=2, ensure_ascii=False))
+    if orjson is not None:
+        content = orjson.dumps(report, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    else:
+        content = json.dumps(report, indent=2, ensure_ascii=False)
+    message = AIMessage(content=content)
     state["messages"].append(message)
     
     return state
 
 # ============= Build Workflow =============
+# The compiled graph holds no per-run state (state is passed to ainvoke), so all agents share one
+@functools.cache
 def build_workflow():
+    from langgraph.graph import StateGraph, END  # only needed once, when the graph is first built
+    
     workflow = StateGraph(dict)
     workflow.add_node("analyze", analyze_task_node)
     workflow.add_node("execute", execute_action_node)
@@ -250,8 +464,14 @@ class LangfuseProjectManagerAgent:
         self.id = "langfuse_pm_001"
         self.name = "Langfuse Project Manager"
     
-    def execute_task(self, task_type: str, project_id: Optional[str] = None) -> Dict[str, Any]:
-        task_id = f"task_{datetime.now().timestamp()}"
+    async def execute_task_async(self, task_type: Union[TaskType, str], project_id: Optional[str] = None) -> Dict[str, Any]:
+        now = datetime.now()
+        task_id = f"task_{now.timestamp()}"
+        if not isinstance(task_type, TaskType):
+            resolved = _TASK_TYPE_BY_VALUE.get(task_type)
+            if resolved is None:
+                return {"status": "error", "error": f"Unknown task type: {task_type}", "task_id": task_id}
+            task_type = resolved
         state = {
             "task_id": task_id,
             "task_type": task_type,
@@ -259,23 +479,46 @@ class LangfuseProjectManagerAgent:
             "action": "",
             "result": {},
             "status": "pending",
-            "messages": [HumanMessage(content=f"Execute: {task_type}")]
+            "messages": [HumanMessage(content=f"Execute: {task_type.value}")],
+            "started_at": now  # reused as the report timestamp
         }
         
         try:
-            result = self.graph.invoke(state)
+            result = await self.graph.ainvoke(state)
             return result
         except Exception as e:
             return {"status": "error", "error": str(e), "task_id": task_id}
     
+    def execute_task(self, task_type: Union[TaskType, str], project_id: Optional[str] = None) -> Dict[str, Any]:
+        # Sync entry point for callers without an event loop (orchestrator, CLI);
+        # inside a running loop, await execute_task_async instead
+        return asyncio.run(self.execute_task_async(task_type, project_id))
+    
     def generate_daily_report(self, project_id: Optional[str] = None) -> Dict[str, Any]:
-        return self.execute_task(TaskType.DAILY_REPORT.value, project_id)
+        return self.execute_task(TaskType.DAILY_REPORT, project_id)
+    
+    async def generate_daily_reports_async(self, project_ids: List[str]) -> List[Dict[str, Any]]:
+        # One report per project, at most LANGFUSE_MAX_CONCURRENCY in flight; results keep input order
+        sem = asyncio.Semaphore(LANGFUSE_MAX_CONCURRENCY)
+        
+        async def one(project_id: str) -> Dict[str, Any]:
+            async with sem:
+                return await self.execute_task_async(TaskType.DAILY_REPORT, project_id)
+        
+        results = await asyncio.gather(*(one(pid) for pid in project_ids), return_exceptions=True)
+        return [
+            {"status": "error", "error": str(r), "project_id": pid} if isinstance(r, BaseException) else r
+            for pid, r in zip(project_ids, results)
+        ]
+    
+    def generate_daily_reports(self, project_ids: List[str]) -> List[Dict[str, Any]]:
+        return asyncio.run(self.generate_daily_reports_async(project_ids))
     
     def analyze_errors(self, project_id: Optional[str] = None) -> Dict[str, Any]:
-        return self.execute_task(TaskType.ERROR_ANALYSIS.value, project_id)
+        return self.execute_task(TaskType.ERROR_ANALYSIS, project_id)
     
     def analyze_performance(self, project_id: Optional[str] = None) -> Dict[str, Any]:
-        return self.execute_task(TaskType.PERFORMANCE_ANALYSIS.value, project_id)
+        return self.execute_task(TaskType.PERFORMANCE_ANALYSIS, project_id)
     
     def check_health(self, project_id: Optional[str] = None) -> Dict[str, Any]:
-        return self.execute_task(TaskType.HEALTH_CHECK.value, project_id)
+        return self.execute_task(TaskType.HEALTH_CHECK, project_id)
@@ -4,18 +4,28 @@ Monitoring & Analytics Specialist Agent
 """
 
 import os
-import json
+import threading
+import time
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 
-from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
+try:
+    import numpy as np
+except ImportError:  # 未安装 numpy 时批量评分逐个系统计算
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # 未安装 numba 时批量评分用 numpy 向量运算
+    njit = None
+
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
-from pydantic import BaseModel
+from langchain_core.messages import BaseMessage
 
 
 # ============= Agent 职能定义 =============
@@ -55,6 +65,18 @@ MONITORING_BACKEND = os.getenv("MONITORING_BACKEND", "langfuse")
 LANGFUSE_API_URL = os.getenv("LANGFUSE_API_URL", "http://localhost:3000")
 LANGFUSE_API_KEY = os.getenv("LANGFUSE_API_KEY", "")
 LANGFUSE_SECRET_KEY = os.getenv("LANGFUSE_SECRET_KEY", "")
+DEFAULT_SYSTEM_TTL = float(os.getenv("LANGFUSE_DEFAULT_PROJECT_TTL", "3600"))  # 默认系统 ID 缓存时间（秒）
+
+# 共享 HTTP 会话: 复用连接池（keep-alive）和认证信息，避免每次调用重新握手
+_SESSION = requests.Session()
+_SESSION.auth = (LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY)
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False)
+)
+_SESSION.mount("http://", _HTTP_ADAPTER)
+_SESSION.mount("https://", _HTTP_ADAPTER)
 
 
 # ============= 数据模型 =============
@@ -81,7 +103,40 @@ class MonitoringMetrics:
     last_24h_errors: int = 0
 
 
-class AgentState(BaseModel):
+@dataclass(slots=True)
+class MetricsBatch:
+    """多个系统的监控指标（列式存储，每个指标一个数组）
+
+    参与评分的列保持 float64，与 _score_health 对 Python float 的比较结果一致；
+    total_requests 用 int64，请求数超过 2^31 也不会溢出
+    """
+    system_ids: List[str]
+    total_requests: "np.ndarray"
+    success_rate: "np.ndarray"
+    avg_latency: "np.ndarray"
+    error_rate: "np.ndarray"
+    p95_latency: "np.ndarray"
+    p99_latency: "np.ndarray"
+    
+    @classmethod
+    def from_metrics(cls, system_ids: List[str], metrics: List[Dict[str, Any]]) -> "MetricsBatch":
+        """由 get_performance_metrics 返回的 metrics 字典列表构建（需要 numpy，缺失的指标按 0 计算）"""
+        def column(key: str, dtype) -> "np.ndarray":
+            return np.fromiter((m.get(key, 0) for m in metrics), dtype=dtype, count=len(metrics))
+        
+        return cls(
+            system_ids=list(system_ids),
+            total_requests=column("total_requests", np.int64),
+            success_rate=column("success_rate", np.float64),
+            avg_latency=column("avg_latency", np.float64),
+            error_rate=column("error_rate", np.float64),
+            p95_latency=column("p95_latency", np.float64),
+            p99_latency=column("p99_latency", np.float64)
+        )
+
+
+@dataclass(slots=True)
+class AgentState:
     """Agent 状态"""
     task_id: str
     task_type: AnalysisTask
@@ -92,9 +147,6 @@ class AgentState(BaseModel):
     result: Dict[str, Any] = field(default_factory=dict)
     status: str = "pending"
     messages: List[BaseMessage] = field(default_factory=list)
-    
-    class Config:
-        arbitrary_types_allowed = True
 
 
 # ============= 监控工具（通用接口）=============
@@ -103,9 +155,8 @@ def get_system_list() -> Dict[str, Any]:
     """获取所有被监控的系统/项目列表"""
     try:
         if MONITORING_BACKEND == "langfuse":
-            response = requests.get(
+            response = _SESSION.get(
                 f"{LANGFUSE_API_URL}/api/projects",
-                auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
                 timeout=10
             )
             response.raise_for_status()
@@ -124,9 +175,8 @@ def get_performance_metrics(system_id: str, time_range: str = "24h") -> Dict[str
     """获取系统性能指标"""
     try:
         if MONITORING_BACKEND == "langfuse":
-            response = requests.get(
+            response = _SESSION.get(
                 f"{LANGFUSE_API_URL}/api/projects/{system_id}/stats",
-                auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
                 timeout=10
             )
             response.raise_for_status()
@@ -155,10 +205,9 @@ def get_error_logs(system_id: str, limit: int = 20) -> Dict[str, Any]:
     """获取错误日志"""
     try:
         if MONITORING_BACKEND == "langfuse":
-            response = requests.get(
+            response = _SESSION.get(
                 f"{LANGFUSE_API_URL}/api/projects/{system_id}/traces",
                 params={"status": "error", "limit": limit},
-                auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
                 timeout=10
             )
             response.raise_for_status()
@@ -177,9 +226,8 @@ def get_trace_details(system_id: str, trace_id: str) -> Dict[str, Any]:
     """获取追踪详情"""
     try:
         if MONITORING_BACKEND == "langfuse":
-            response = requests.get(
+            response = _SESSION.get(
                 f"{LANGFUSE_API_URL}/api/projects/{system_id}/traces/{trace_id}",
-                auth=(LANGFUSE_API_KEY, LANGFUSE_SECRET_KEY),
                 timeout=10
             )
             response.raise_for_status()
@@ -193,6 +241,92 @@ def get_trace_details(system_id: str, trace_id: str) -> Dict[str, Any]:
         return {"status": "error", "error": str(e)}
 
 
+# ============= 健康评分 =============
+def _score_health(m: Dict[str, Any]):
+    """单个系统的健康评分（0-100）及问题列表
+
+    缺失的指标按 0 计算（与 get_performance_metrics 的默认值及 MetricsBatch 一致）
+    """
+    health_score = 100
+    issues = []
+    error_rate = m.get("error_rate", 0)
+    avg_latency = m.get("avg_latency", 0)
+    success_rate = m.get("success_rate", 0)
+    
+    # 检查错误率
+    if error_rate > 0.05:  # 超过 5%
+        health_score -= 30
+        issues.append(f"错误率过高: {error_rate*100:.1f}%")
+    elif error_rate > 0.01:  # 超过 1%
+        health_score -= 10
+        issues.append(f"错误率偏高: {error_rate*100:.1f}%")
+    
+    # 检查延迟
+    if avg_latency > 5000:  # 超过 5s
+        health_score -= 20
+        issues.append(f"平均延迟过高: {avg_latency:.0f}ms")
+    elif avg_latency > 2000:  # 超过 2s
+        health_score -= 10
+        issues.append(f"平均延迟偏高: {avg_latency:.0f}ms")
+    
+    # 检查成功率
+    if success_rate < 0.95:  # 低于 95%
+        health_score -= 20
+        issues.append(f"成功率偏低: {success_rate*100:.1f}%")
+    
+    return health_score, issues
+
+
+def _health_scores_kernel(error_rate, avg_latency, success_rate):
+    """逐元素计算健康评分的循环内核（有 numba 时 JIT 编译）"""
+    er_high, er_warn = 0.05, 0.01
+    lat_high, lat_warn = 5000.0, 2000.0
+    sr_min = 0.95
+    n = error_rate.size
+    out = np.empty(n, np.int32)
+    for i in range(n):
+        s = 100
+        er = error_rate[i]
+        if er > er_high:
+            s -= 30
+        elif er > er_warn:
+            s -= 10
+        lat = avg_latency[i]
+        if lat > lat_high:
+            s -= 20
+        elif lat > lat_warn:
+            s -= 10
+        if success_rate[i] < sr_min:
+            s -= 20
+        out[i] = s
+    return out
+
+
+if njit is not None:
+    _health_scores_kernel = njit(cache=True)(_health_scores_kernel)
+
+
+def compute_health_scores_vec(batch: MetricsBatch) -> "np.ndarray":
+    """批量计算健康评分，阈值和比较精度（float64）与 _score_health 相同"""
+    if njit is not None:
+        return _health_scores_kernel(batch.error_rate, batch.avg_latency, batch.success_rate)
+    
+    er, lat, sr = batch.error_rate, batch.avg_latency, batch.success_rate
+    score = np.full(len(er), 100, dtype=np.int32)
+    score -= np.where(er > 0.05, 30, np.where(er > 0.01, 10, 0)).astype(np.int32)
+    score -= np.where(lat > 5000, 20, np.where(lat > 2000, 10, 0)).astype(np.int32)
+    score -= np.where(sr < 0.95, 20, 0).astype(np.int32)
+    return score
+
+
+def compute_health_scores(system_ids: List[str], metrics: List[Dict[str, Any]]) -> Dict[str, int]:
+    """多个系统的健康评分：有 numpy 时列式向量化计算，否则逐个计算"""
+    if np is None:
+        return {sid: _score_health(m)[0] for sid, m in zip(system_ids, metrics)}
+    scores = compute_health_scores_vec(MetricsBatch.from_metrics(system_ids, metrics))
+    return dict(zip(system_ids, scores.tolist()))
+
+
 @tool
 def generate_health_report(system_id: str) -> Dict[str, Any]:
     """生成系统健康报告"""
@@ -206,29 +340,7 @@ def generate_health_report(system_id: str) -> Dict[str, Any]:
         m = metrics["metrics"]
         
         # 健康评分（0-100）
-        health_score = 100
-        issues = []
-        
-        # 检查错误率
-        if m["error_rate"] > 0.05:  # 超过 5%
-            health_score -= 30
-            issues.append(f"错误率过高: {m['error_rate']*100:.1f}%")
-        elif m["error_rate"] > 0.01:  # 超过 1%
-            health_score -= 10
-            issues.append(f"错误率偏高: {m['error_rate']*100:.1f}%")
-        
-        # 检查延迟
-        if m["avg_latency"] > 5000:  # 超过 5s
-            health_score -= 20
-            issues.append(f"平均延迟过高: {m['avg_latency']:.0f}ms")
-        elif m["avg_latency"] > 2000:  # 超过 2s
-            health_score -= 10
-            issues.append(f"平均延迟偏高: {m['avg_latency']:.0f}ms")
-        
-        # 检查成功率
-        if m["success_rate"] < 0.95:  # 低于 95%
-            health_score -= 20
-            issues.append(f"成功率偏低: {m['success_rate']*100:.1f}%")
+        health_score, issues = _score_health(m)
         
         # 健康等级
         if health_score >= 90:
@@ -254,6 +366,28 @@ def generate_health_report(system_id: str) -> Dict[str, Any]:
 
 
 # ============= Agent 执行逻辑 =============
+# 未指定系统时使用的默认系统（系统列表中的第一个），进程内缓存
+_DEFAULT_SYSTEM_ID: Optional[str] = None
+_DEFAULT_SYSTEM_EXPIRES = 0.0
+_DEFAULT_SYSTEM_LOCK = threading.Lock()
+
+
+def _get_default_system_id() -> Optional[str]:
+    """获取默认系统 ID（DEFAULT_SYSTEM_TTL 内只查询一次），没有系统时返回 None"""
+    global _DEFAULT_SYSTEM_ID, _DEFAULT_SYSTEM_EXPIRES
+    if _DEFAULT_SYSTEM_ID is not None and time.monotonic() < _DEFAULT_SYSTEM_EXPIRES:
+        return _DEFAULT_SYSTEM_ID
+    with _DEFAULT_SYSTEM_LOCK:
+        if _DEFAULT_SYSTEM_ID is not None and time.monotonic() < _DEFAULT_SYSTEM_EXPIRES:
+            return _DEFAULT_SYSTEM_ID
+        systems = get_system_list.invoke({})
+        if systems["status"] != "success" or not systems["systems"]:
+            return None
+        _DEFAULT_SYSTEM_ID = systems["systems"][0]["id"]
+        _DEFAULT_SYSTEM_EXPIRES = time.monotonic() + DEFAULT_SYSTEM_TTL
+        return _DEFAULT_SYSTEM_ID
+
+
 class MonitoringSpecialistAgent:
     """监控与分析专家 Agent"""
     
@@ -272,10 +406,8 @@ class MonitoringSpecialistAgent:
         
         if task_type == AnalysisTask.HEALTH_CHECK:
             if not system_id:
-                systems = get_system_list()
-                if systems["status"] == "success" and systems["systems"]:
-                    system_id = systems["systems"][0]["id"]
-                else:
+                system_id = _get_default_system_id()
+                if not system_id:
                     return {"status": "error", "error": "No system found"}
             
             return generate_health_report(system_id)
@@ -289,6 +421,16 @@ class MonitoringSpecialistAgent:
         else:
             return {"status": "error", "error": "Unsupported task type"}
     
+    def get_health_scores(self, system_ids: List[str]) -> Dict[str, int]:
+        """批量获取多个系统的健康评分（仪表盘用），取数失败的系统不计入"""
+        ids, metrics = [], []
+        for system_id in system_ids:
+            result = get_performance_metrics.invoke({"system_id": system_id, "time_range": "24h"})
+            if result.get("status") == "success":
+                ids.append(system_id)
+                metrics.append(result["metrics"])
+        return compute_health_scores(ids, metrics)
+    
     def get_info(self) -> Dict[str, Any]:
         """获取 Agent 信息"""
         return {
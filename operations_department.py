@@ -3,9 +3,8 @@
 Operations Department - 负责所有工具和系统的运维管理
 """
 
-from enum import Enum
-from typing import Dict, Any, List
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 
 
 # ============= 运维部门定义 =============
@@ -163,28 +162,33 @@ class OperationsPositions:
         ]
     }
     
+    # 职位名 -> 职位定义，类定义时构建一次（只读）
+    ALL_POSITIONS = MappingProxyType({
+        "Tool Operator": TOOL_OPERATOR,
+        "Langfuse Operations Manager": LANGFUSE_MANAGER,
+        "GitHub Operations Manager": GITHUB_MANAGER,
+        "Slack Operations Manager": SLACK_MANAGER,
+        "Database Operations Manager": DATABASE_MANAGER,
+        "Operations Lead": OPERATIONS_LEAD
+    })
+    
+    # 工具名 -> 对应的管理专家职位
+    _TOOL_MAP = MappingProxyType({
+        "langfuse": LANGFUSE_MANAGER,
+        "github": GITHUB_MANAGER,
+        "slack": SLACK_MANAGER,
+        "database": DATABASE_MANAGER
+    })
+    
     @classmethod
-    def get_all_positions(cls) -> Dict[str, Dict[str, Any]]:
+    def get_all_positions(cls) -> Mapping[str, Dict[str, Any]]:
         """获取所有职位"""
-        return {
-            "Tool Operator": cls.TOOL_OPERATOR,
-            "Langfuse Operations Manager": cls.LANGFUSE_MANAGER,
-            "GitHub Operations Manager": cls.GITHUB_MANAGER,
-            "Slack Operations Manager": cls.SLACK_MANAGER,
-            "Database Operations Manager": cls.DATABASE_MANAGER,
-            "Operations Lead": cls.OPERATIONS_LEAD
-        }
+        return cls.ALL_POSITIONS
     
     @classmethod
-    def get_manager_by_tool(cls, tool_name: str) -> Dict[str, Any]:
+    def get_manager_by_tool(cls, tool_name: str) -> Optional[Dict[str, Any]]:
         """根据工具名称获取对应的管理专家职位"""
-        tool_position_map = {
-            "langfuse": cls.LANGFUSE_MANAGER,
-            "github": cls.GITHUB_MANAGER,
-            "slack": cls.SLACK_MANAGER,
-            "database": cls.DATABASE_MANAGER
-        }
-        return tool_position_map.get(tool_name.lower())
+        return cls._TOOL_MAP.get(tool_name.lower())
 
 
 # ============= Agent 示例 =============
@@ -250,6 +254,9 @@ class SampleOperationsAgents:
         ],
         "experience_years": 5
     }
+    
+    # 全部示例，按展示顺序
+    ALL = (LANGFUSE_MANAGER_001, GITHUB_MANAGER_001, SLACK_MANAGER_001, OPERATIONS_LEAD_001)
 
 
 # ============= 工作流示例 =============
@@ -328,10 +335,7 @@ if __name__ == "__main__":
     print("👥 示例 Agent")
     print("="*60)
     
-    agents = SampleOperationsAgents()
-    for agent_name in ['LANGFUSE_MANAGER_001', 'GITHUB_MANAGER_001', 
-                       'SLACK_MANAGER_001', 'OPERATIONS_LEAD_001']:
-        agent = getattr(agents, agent_name)
+    for agent in SampleOperationsAgents.ALL:
         print(f"\n  • {agent['agent_name']}")
         print(f"    职位: {agent['position']}")
         if 'managed_tool' in agent:
@@ -3,6 +3,10 @@ Organization System Examples and Tests
 组织系统示例和测试
 """
 
+import logging
+import sys
+from typing import Optional
+
 from organization_system import (
     OrganizationSystem, setup_default_organization,
     DepartmentType, PositionLevel
@@ -10,6 +14,8 @@ from organization_system import (
 
 # 全局组织对象
 _org = None
+# 已执行示例 1、2 的组织对象，重复运行后续示例时复用
+_populated_org = None
 
 def get_org():
     """获取全局组织对象"""
@@ -19,13 +25,32 @@ def get_org():
     return _org
 
 
-def example_1_setup_organization():
+def reset_org():
+    """丢弃全局组织对象，下次 get_org() 时重新创建"""
+    global _org, _populated_org
+    _org = None
+    _populated_org = None
+
+
+def get_fully_populated_org() -> OrganizationSystem:
+    """返回已完成示例 1、2（组织结构 + Agent）的组织对象，只搭建一次"""
+    global _populated_org
+    if _populated_org is None:
+        org = get_org()
+        example_1_setup_organization(org)
+        example_2_add_agents(org)
+        _populated_org = org
+    return _populated_org
+
+
+def example_1_setup_organization(org: Optional[OrganizationSystem] = None):
     """示例 1: 设置组织结构"""
     print("\n" + "="*60)
     print("【示例 1】设置组织结构")
     print("="*60)
     
-    org = get_org()
+    if org is None:
+        org = get_org()
     
     print("\n📋 部门列表:")
     depts = org.list_departments()
@@ -36,76 +61,75 @@ def example_1_setup_organization():
         print(f"    - 职位: {', '.join(dept['positions'])}")
 
 
-def example_2_add_agents():
+def example_2_add_agents(org: Optional[OrganizationSystem] = None):
     """示例 2: 添加 Agent 到部门"""
     print("\n" + "="*60)
     print("【示例 2】添加 Agent 到部门")
     print("="*60)
     
-    org = get_org()
+    if org is None:
+        org = get_org()
     
     # 添加 PM Agent
     print("\n添加 PM Agent:")
-    org.add_agent_to_department(
-        dept_id="pm_dept",
-        agent_id="pm_001",
-        agent_name="张三 - 项目经理",
-        position_name="Senior PM",
-        skills=["project_management", "leadership", "communication"]
-    )
-    
-    org.add_agent_to_department(
-        dept_id="pm_dept",
-        agent_id="pm_002",
-        agent_name="李四 - 项目经理",
-        position_name="Senior PM",
-        skills=["project_management", "risk_management", "communication"]
-    )
+    org.add_agents_to_department("pm_dept", [
+        {
+            "agent_id": "pm_001",
+            "agent_name": "张三 - 项目经理",
+            "position_name": "Senior PM",
+            "skills": ["project_management", "leadership", "communication"]
+        },
+        {
+            "agent_id": "pm_002",
+            "agent_name": "李四 - 项目经理",
+            "position_name": "Senior PM",
+            "skills": ["project_management", "risk_management", "communication"]
+        }
+    ])
     
     # 添加开发 Agent
     print("\n添加开发 Agent:")
-    org.add_agent_to_department(
-        dept_id="tech_dept",
-        agent_id="dev_001",
-        agent_name="王五 - 高级开发",
-        position_name="Senior Developer",
-        skills=["programming", "system_design", "python", "javascript"]
-    )
-    
-    org.add_agent_to_department(
-        dept_id="tech_dept",
-        agent_id="dev_002",
-        agent_name="赵六 - 初级开发",
-        position_name="Junior Developer",
-        skills=["programming", "testing", "python"]
-    )
+    org.add_agents_to_department("tech_dept", [
+        {
+            "agent_id": "dev_001",
+            "agent_name": "王五 - 高级开发",
+            "position_name": "Senior Developer",
+            "skills": ["programming", "system_design", "python", "javascript"]
+        },
+        {
+            "agent_id": "dev_002",
+            "agent_name": "赵六 - 初级开发",
+            "position_name": "Junior Developer",
+            "skills": ["programming", "testing", "python"]
+        }
+    ])
     
     # 添加数据 Agent
     print("\n添加数据分析 Agent:")
-    org.add_agent_to_department(
-        dept_id="data_dept",
-        agent_id="analyst_001",
-        agent_name="孙七 - 高级分析师",
-        position_name="Senior Analyst",
-        skills=["data_analysis", "sql", "statistics", "visualization"]
-    )
-    
-    org.add_agent_to_department(
-        dept_id="data_dept",
-        agent_id="analyst_002",
-        agent_name="周八 - 初级分析师",
-        position_name="Junior Analyst",
-        skills=["data_analysis", "sql"]
-    )
+    org.add_agents_to_department("data_dept", [
+        {
+            "agent_id": "analyst_001",
+            "agent_name": "孙七 - 高级分析师",
+            "position_name": "Senior Analyst",
+            "skills": ["data_analysis", "sql", "statistics", "visualization"]
+        },
+        {
+            "agent_id": "analyst_002",
+            "agent_name": "周八 - 初级分析师",
+            "position_name": "Junior Analyst",
+            "skills": ["data_analysis", "sql"]
+        }
+    ])
 
 
-def example_3_create_unit():
+def example_3_create_unit(org: Optional[OrganizationSystem] = None):
     """示例 3: 创建 Unit（工作小组）"""
     print("\n" + "="*60)
     print("【示例 3】创建 Unit（工作小组）")
     print("="*60)
     
-    org = get_org()
+    if org is None:
+        org = get_org()
     
     # 创建项目 A 的 Unit
     print("\n创建项目 A Unit:")
@@ -162,13 +186,14 @@ def example_3_create_unit():
             print(f"      责任: {supporter['responsibilities']}")
 
 
-def example_4_find_agents():
+def example_4_find_agents(org: Optional[OrganizationSystem] = None):
     """示例 4: 查找合适的 Agent 加入 Unit"""
     print("\n" + "="*60)
     print("【示例 4】查找合适的 Agent 加入 Unit")
     print("="*60)
     
-    org = get_org()
+    if org is None:
+        org = get_org()
     
     # 查找具有特定技能的可用 Agent
     print("\n查找具有 'data_analysis' 技能的可用 Agent:")
@@ -201,13 +226,14 @@ def example_4_find_agents():
         print("  没有找到符合条件的 Agent")
 
 
-def example_5_agent_status():
+def example_5_agent_status(org: Optional[OrganizationSystem] = None):
     """示例 5: 查看 Agent 状态"""
     print("\n" + "="*60)
     print("【示例 5】查看 Agent 状态")
     print("="*60)
     
-    org = get_org()
+    if org is None:
+        org = get_org()
     
     print("\nAgent 'pm_001' 状态:")
     status = org.get_agent_status("pm_001")
@@ -222,26 +248,28 @@ def example_5_agent_status():
         print("  Agent 不存在")
 
 
-def example_6_organization_report():
+def example_6_organization_report(org: Optional[OrganizationSystem] = None):
     """示例 6: 生成组织状态报告"""
     print("\n" + "="*60)
     print("【示例 6】组织状态报告")
     print("="*60)
     
-    org = get_org()
+    if org is None:
+        org = get_org()
     
     # 生成并打印报告
     report = org.generate_report()
     print(report)
 
 
-def example_7_release_agent():
+def example_7_release_agent(org: Optional[OrganizationSystem] = None):
     """示例 7: 从 Unit 释放 Agent"""
     print("\n" + "="*60)
     print("【示例 7】从 Unit 释放 Agent")
     print("="*60)
     
-    org = get_org()
+    if org is None:
+        org = get_org()
     
     print("\n当前 Agent 'dev_001' 状态:")
     status = org.get_agent_status("dev_001")
@@ -260,13 +288,14 @@ def example_7_release_agent():
         print(f"  所属 Unit: {status['assigned_unit_id']}")
 
 
-def example_8_disband_unit():
+def example_8_disband_unit(org: Optional[OrganizationSystem] = None):
     """示例 8: 解散 Unit"""
     print("\n" + "="*60)
     print("【示例 8】解散 Unit 和释放成员")
     print("="*60)
     
-    org = get_org()
+    if org is None:
+        org = get_org()
     
     print("\n解散 Unit 'unit_project_a':")
     org.disband_unit("unit_project_a")
@@ -320,4 +349,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     main()
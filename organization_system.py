@@ -3,16 +3,37 @@ Integrated Organization System
 综合组织管理系统 - 部门 + Unit + Agent 三层一体
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, List, Optional, Union
 from agent_department import (
     DepartmentSystem, Department, DepartmentType, Position, 
-    PositionLevel, AgentInPosition, PREDEFINED_POSITIONS
+    PositionLevel, AgentInPosition, PREDEFINED_POSITIONS, PREDEFINED_POSITIONS_BY_TYPE
 )
 from agent_unit import (
     UnitManager, AgentUnit, UnitMember, UnitRole, UnitStatus
 )
-import json
 from datetime import datetime
+import copy
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# 同一毫秒内复用时间戳字符串，频繁查询状态时不必每次格式化
+_NOW_CACHE_TTL = 0.001  # 秒
+_now_cache = ("", float("-inf"))
+
+
+def _now_iso() -> str:
+    """返回当前时间的 ISO 字符串（_NOW_CACHE_TTL 内复用）"""
+    global _now_cache
+    text, stamp = _now_cache
+    now = time.monotonic()
+    if now - stamp >= _NOW_CACHE_TTL:
+        text = datetime.now().isoformat()
+        _now_cache = (text, now)
+    return text
 
 
 class OrganizationSystem:
@@ -21,6 +42,9 @@ class OrganizationSystem:
     def __init__(self):
         self.department_system = DepartmentSystem()
         self.unit_manager = UnitManager()
+        # (部门版本, Unit 版本) -> 结果；任一子系统修改后版本变化，缓存自动失效
+        self._status_cache: Optional[tuple] = None
+        self._report_cache: Optional[tuple] = None
     
     # ==================== 部门管理 ====================
     
@@ -28,7 +52,7 @@ class OrganizationSystem:
         self,
         dept_id: str,
         name: str,
-        dept_type: DepartmentType,
+        dept_type: Union[DepartmentType, str],
         description: str,
         lead_agent_id: str,
         lead_agent_name: str,
@@ -49,7 +73,7 @@ class OrganizationSystem:
         
         # 添加预定义职位
         if position_names:
-            dept_positions = PREDEFINED_POSITIONS.get(dept_type.value, {})
+            dept_positions = PREDEFINED_POSITIONS_BY_TYPE.get(dept.type, {})
             for pos_name in position_names:
                 if pos_name in dept_positions:
                     self.department_system.add_position_to_department(
@@ -72,9 +96,9 @@ class OrganizationSystem:
                 "name": d.name,
                 "type": d.type.value,
                 "lead": d.lead_agent_name,
-                "total_agents": len(d.get_all_agents()),
-                "available_agents": len(d.get_available_agents()),
-                "positions": list(d.positions.keys())
+                "total_agents": d.total_agents,
+                "available_agents": d.available_agents,
+                "positions": list(d.position_names)
             }
             for d in depts
         ]
@@ -90,24 +114,13 @@ class OrganizationSystem:
         """添加 Agent 到部门"""
         dept = self.department_system.get_department(dept_id)
         if not dept:
-            print(f"❌ 部门 {dept_id} 不存在")
+            logger.error("❌ 部门 %s 不存在", dept_id)
             return False
         
-        if position_name not in dept.positions:
-            print(f"❌ 职位 '{position_name}' 不存在于部门 '{dept.name}'")
+        position = self._resolve_position(dept, position_name)
+        if not position:
             return False
         
-        # 获取位置的职位对象
-        if dept.positions[position_name]:
-            position = dept.positions[position_name][0].position
-        else:
-            # 从预定义职位获取
-            dept_type_name = dept.type.value if hasattr(dept.type, 'value') else str(dept.type)
-            position = PREDEFINED_POSITIONS.get(dept_type_name, {}).get(position_name)
-            if not position:
-                print(f"❌ 无法获取职位信息")
-                return False
-        
         agent = AgentInPosition(
             agent_id=agent_id,
             agent_name=agent_name,
@@ -118,6 +131,63 @@ class OrganizationSystem:
         
         return self.department_system.add_agent_to_department(dept_id, agent)
     
+    def add_agents_to_department(self, dept_id: str, specs: List[Dict[str, Any]]) -> List[bool]:
+        """批量添加 Agent 到部门
+        
+        specs 中每项包含 agent_id / agent_name / position_name / skills；
+        部门和各职位只解析一次，返回与 specs 对应的结果列表。
+        """
+        dept = self.department_system.get_department(dept_id)
+        if not dept:
+            logger.error("❌ 部门 %s 不存在", dept_id)
+            return [False] * len(specs)
+        
+        positions: Dict[str, Optional[Position]] = {}
+        results: List[bool] = []
+        agents: List[AgentInPosition] = []
+        slots: List[int] = []  # agents[i] 在 results 中的下标
+        
+        for spec in specs:
+            position_name = spec["position_name"]
+            if position_name not in positions:
+                positions[position_name] = self._resolve_position(dept, position_name)
+            position = positions[position_name]
+            if not position:
+                results.append(False)
+                continue
+            
+            slots.append(len(results))
+            results.append(False)
+            agents.append(AgentInPosition(
+                agent_id=spec["agent_id"],
+                agent_name=spec["agent_name"],
+                position=position,
+                department_id=dept_id,
+                skills=spec["skills"]
+            ))
+        
+        for i, ok in zip(slots, self.department_system.add_agents_to_department(dept_id, agents)):
+            results[i] = ok
+        return results
+    
+    @staticmethod
+    def _resolve_position(dept: Department, position_name: str) -> Optional[Position]:
+        """取得部门中某职位的 Position 对象，不存在时打印原因并返回 None"""
+        if position_name not in dept.positions:
+            logger.error("❌ 职位 '%s' 不存在于部门 '%s'", position_name, dept.name)
+            return None
+        
+        # 获取位置的职位对象
+        position = dept.position_defs.get(position_name)
+        if not position:
+            # 从预定义职位获取
+            position = PREDEFINED_POSITIONS_BY_TYPE.get(dept.type, {}).get(position_name)
+            if not position:
+                logger.error("❌ 无法获取职位信息")
+                return None
+        
+        return position
+    
     # ==================== Unit 管理 ====================
     
     def create_unit_from_agents(
@@ -132,7 +202,7 @@ class OrganizationSystem:
         """创建 Unit（指定负责人）"""
         lead_agent = self.department_system.get_agent_by_id(lead_agent_id)
         if not lead_agent:
-            print(f"❌ Agent {lead_agent_id} 不存在")
+            logger.error("❌ Agent %s 不存在", lead_agent_id)
             return None
         
         lead_member = UnitMember(
@@ -156,45 +226,55 @@ class OrganizationSystem:
         
         if unit:
             # 分配负责人到 Unit
-            self.department_system.assign_agent_to_unit(lead_agent_id, unit_id)
+            self.department_system.assign_agent_obj(lead_agent, unit_id)
         
         return unit
     
-    def add_executor_to_unit(
+    def _add_member(
         self,
         unit_id: str,
         agent_id: str,
-        responsibilities: str = ""
+        role: UnitRole,
+        responsibilities: str
     ) -> bool:
-        """添加执行者到 Unit"""
+        """添加成员到 Unit（Agent 和 Unit 各只查找一次）"""
         agent = self.department_system.get_agent_by_id(agent_id)
         if not agent:
-            print(f"❌ Agent {agent_id} 不存在")
+            logger.error("❌ Agent %s 不存在", agent_id)
             return False
         
         unit = self.unit_manager.get_unit(unit_id)
         if not unit:
-            print(f"❌ Unit {unit_id} 不存在")
+            logger.error("❌ Unit %s 不存在", unit_id)
             return False
         
         member = UnitMember(
             agent_id=agent.agent_id,
             agent_name=agent.agent_name,
-            role=UnitRole.EXECUTOR,
+            role=role,
             department_id=agent.department_id,
             position_name=agent.position.name,
             skills=agent.skills,
             responsibilities=responsibilities
         )
         
-        result = self.unit_manager.add_member_to_unit(unit_id, member, UnitRole.EXECUTOR)
+        result = self.unit_manager.add_member_to_unit_obj(unit, member, role)
         
         if result:
             # 分配 Agent 到 Unit
-            self.department_system.assign_agent_to_unit(agent_id, unit_id)
+            self.department_system.assign_agent_obj(agent, unit_id)
         
         return result
     
+    def add_executor_to_unit(
+        self,
+        unit_id: str,
+        agent_id: str,
+        responsibilities: str = ""
+    ) -> bool:
+        """添加执行者到 Unit"""
+        return self._add_member(unit_id, agent_id, UnitRole.EXECUTOR, responsibilities)
+    
     def add_supporter_to_unit(
         self,
         unit_id: str,
@@ -202,33 +282,7 @@ class OrganizationSystem:
         responsibilities: str = ""
     ) -> bool:
         """添加支持者到 Unit"""
-        agent = self.department_system.get_agent_by_id(agent_id)
-        if not agent:
-            print(f"❌ Agent {agent_id} 不存在")
-            return False
-        
-        unit = self.unit_manager.get_unit(unit_id)
-        if not unit:
-            print(f"❌ Unit {unit_id} 不存在")
-            return False
-        
-        member = UnitMember(
-            agent_id=agent.agent_id,
-            agent_name=agent.agent_name,
-            role=UnitRole.SUPPORTER,
-            department_id=agent.department_id,
-            position_name=agent.position.name,
-            skills=agent.skills,
-            responsibilities=responsibilities
-        )
-        
-        result = self.unit_manager.add_member_to_unit(unit_id, member, UnitRole.SUPPORTER)
-        
-        if result:
-            # 分配 Agent 到 Unit
-            self.department_system.assign_agent_to_unit(agent_id, unit_id)
-        
-        return result
+        return self._add_member(unit_id, agent_id, UnitRole.SUPPORTER, responsibilities)
     
     # ==================== 查询功能 ====================
     
@@ -245,19 +299,17 @@ class OrganizationSystem:
             skills=skills,
             position_level=position_level,
             available_only=available_only,
-            dept_type=dept_type
+            dept_type=dept_type,
+            limit=limit
         )
         
-        if limit:
-            agents = agents[:limit]
-        
         return [
             {
                 "agent_id": a.agent_id,
                 "agent_name": a.agent_name,
                 "department": a.department_id,
                 "position": a.position.name,
-                "level": a.position.level.value,
+                "level": a.position.level_value,
                 "skills": a.skills,
                 "available": a.availability
             }
@@ -270,44 +322,7 @@ class OrganizationSystem:
         if not unit:
             return None
         
-        return {
-            "id": unit.id,
-            "name": unit.name,
-            "description": unit.description,
-            "project_id": unit.project_id,
-            "status": unit.status.value,
-            "priority": unit.priority,
-            "lead": {
-                "agent_id": unit.lead_member.agent_id,
-                "agent_name": unit.lead_member.agent_name,
-                "department": unit.lead_member.department_id,
-                "position": unit.lead_member.position_name
-            } if unit.lead_member else None,
-            "executors": [
-                {
-                    "agent_id": m.agent_id,
-                    "agent_name": m.agent_name,
-                    "department": m.department_id,
-                    "position": m.position_name,
-                    "responsibilities": m.responsibilities
-                }
-                for m in unit.executor_members
-            ],
-            "supporters": [
-                {
-                    "agent_id": m.agent_id,
-                    "agent_name": m.agent_name,
-                    "department": m.department_id,
-                    "position": m.position_name,
-                    "responsibilities": m.responsibilities
-                }
-                for m in unit.supporter_members
-            ],
-            "member_count": unit.get_member_count(),
-            "tasks_count": len(unit.tasks),
-            "created_at": unit.created_at,
-            "started_at": unit.started_at
-        }
+        return unit.to_info()
     
     def get_agent_status(self, agent_id: str) -> Optional[Dict]:
         """查看 Agent 状态"""
@@ -320,7 +335,7 @@ class OrganizationSystem:
             "agent_name": agent.agent_name,
             "department": agent.department_id,
             "position": agent.position.name,
-            "level": agent.position.level.value,
+            "level": agent.position.level_value,
             "skills": agent.skills,
             "availability": agent.availability,
             "assigned_unit_id": agent.assigned_unit_id,
@@ -333,7 +348,7 @@ class OrganizationSystem:
         """从 Unit 释放 Agent 回到部门"""
         result = self.department_system.release_agent_from_unit(agent_id)
         if result:
-            print(f"✓ Agent 已释放，返回部门")
+            logger.info("✓ Agent 已释放，返回部门")
         return result
     
     def disband_unit(self, unit_id: str) -> bool:
@@ -343,8 +358,9 @@ class OrganizationSystem:
             return False
         
         # 释放所有成员
-        for member in unit.get_all_members():
-            self.department_system.release_agent_from_unit(member.agent_id)
+        self.department_system.release_agents_from_unit(
+            member.agent_id for member in unit.iter_members()
+        )
         
         # 解散 Unit
         result = self.unit_manager.disband_unit(unit_id)
@@ -352,13 +368,30 @@ class OrganizationSystem:
     
     # ==================== 统计和报告 ====================
     
+    def _state_version(self) -> tuple:
+        """当前组织状态的版本号"""
+        return (self.department_system.version, self.unit_manager.version)
+    
     def get_organization_status(self) -> Dict[str, Any]:
-        """获取组织总体状态"""
+        """获取组织总体状态（状态未变化时复用上次统计，仅刷新时间戳）
+
+        返回缓存的深拷贝，调用方修改嵌套的部门 / Unit 统计不会影响之后的调用
+        """
+        return {"timestamp": _now_iso(), **copy.deepcopy(self._cached_status())}
+    
+    def _cached_status(self) -> Dict[str, Any]:
+        """不含时间戳的状态统计（版本未变时直接返回缓存）"""
+        version = self._state_version()
+        if self._status_cache is None or self._status_cache[0] != version:
+            self._status_cache = (version, self._compute_status())
+        return self._status_cache[1]
+    
+    def _compute_status(self) -> Dict[str, Any]:
+        """统计部门和 Unit 状态（不含时间戳）"""
         dept_stats = self.department_system.get_statistics()
         unit_stats = self.unit_manager.get_statistics()
         
         return {
-            "timestamp": datetime.now().isoformat(),
             "departments": dept_stats,
             "units": unit_stats,
             "summary": {
@@ -373,40 +406,55 @@ class OrganizationSystem:
         }
     
     def generate_report(self) -> str:
-        """生成组织状态报告"""
-        status = self.get_organization_status()
+        """生成组织状态报告（状态未变化时复用上次生成的正文）"""
+        version = self._state_version()
+        if self._report_cache is None or self._report_cache[0] != version:
+            self._report_cache = (version, self._render_report_body(self._cached_status()))
         
-        report = f"""
+        # 时间戳只在拼标题时生成，正文和统计都不依赖它
+        return f"""
 ╔════════════════════════════════════════════════════════════╗
-║          组织系统状态报告 | {status['timestamp']}
+║          组织系统状态报告 | {_now_iso()}
 ╚════════════════════════════════════════════════════════════╝
-
+""" + self._report_cache[1]
+    
+    def _render_report_body(self, status: Dict[str, Any]) -> str:
+        """报告中标题以下的部分"""
+        summary = status['summary']
+        units = status['units']
+        
+        # 各段先收集到列表，最后一次拼接
+        parts = [f"""
 【部门信息】
-  • 总部门数: {status['summary']['total_departments']}
+  • 总部门数: {summary['total_departments']}
   • 部门列表:
-"""
-        for dept_id, dept_info in status['departments']['departments'].items():
-            report += f"    - {dept_info['name']} ({dept_info['type']}): {dept_info['total_agents']} 个 Agent\n"
+"""]
+        parts.extend(
+            f"    - {dept_info['name']} ({dept_info['type']}): {dept_info['total_agents']} 个 Agent\n"
+            for dept_info in status['departments']['departments'].values()
+        )
         
-        report += f"""
+        parts.append(f"""
 【人员情况】
-  • 总人数: {status['summary']['total_agents']}
-  • 可用人数: {status['summary']['available_agents']}
-  • 已分配人数: {status['summary']['assigned_agents']}
-  • 人力利用率: {status['summary']['utilization_rate']}
+  • 总人数: {summary['total_agents']}
+  • 可用人数: {summary['available_agents']}
+  • 已分配人数: {summary['assigned_agents']}
+  • 人力利用率: {summary['utilization_rate']}
 
 【Unit 信息】
-  • 总 Unit 数: {status['summary']['total_units']}
-  • 活跃 Unit: {status['summary']['active_units']}
-  • 成员总数: {status['units']['total_members']}
-  • 任务总数: {status['units']['total_tasks']}
+  • 总 Unit 数: {summary['total_units']}
+  • 活跃 Unit: {summary['active_units']}
+  • 成员总数: {units['total_members']}
+  • 任务总数: {units['total_tasks']}
   • Unit 状态分布:
-"""
-        for status_type, count in status['units']['units_by_status'].items():
-            report += f"    - {status_type}: {count}\n"
+""")
+        parts.extend(
+            f"    - {status_type}: {count}\n"
+            for status_type, count in units['units_by_status'].items()
+        )
         
-        report += "\n╚════════════════════════════════════════════════════════════╝\n"
-        return report
+        parts.append("\n╚════════════════════════════════════════════════════════════╝\n")
+        return "".join(parts)
 
 
 # 便捷初始化函数
@@ -455,5 +503,5 @@ def setup_default_organization():
         PREDEFINED_POSITIONS["pm"]["PM Lead"]
     )
     
-    print("✓ 默认组织结构已创建")
+    logger.info("✓ 默认组织结构已创建")
     return org
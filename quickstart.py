@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import logging
 import sys
 import json
 from datetime import datetime
@@ -164,4 +165,5 @@ Welcome to DEVOLLEN Agent System!
         traceback.print_exc()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
     main()
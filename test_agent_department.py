@@ -0,0 +1,63 @@
+"""
+DepartmentSystem 持久化测试
+"""
+
+import gc
+import json
+import logging
+import time
+import weakref
+
+import pytest
+
+from agent_department import AgentInPosition, DepartmentSystem, DepartmentType, Position, PositionLevel
+
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+def _make_system(tmp_path, **kwargs):
+    return DepartmentSystem(
+        storage_dir=str(tmp_path / "departments"),
+        storage_file=str(tmp_path / "none.json"),
+        **kwargs
+    )
+
+
+def test_trailing_change_is_saved_by_timer(tmp_path):
+    system = _make_system(tmp_path, autosave_interval=0.2)
+    system.create_department("tech", "技术部", DepartmentType.TECHNOLOGY, "", "lead", "Lead")
+    system.create_department("data", "数据部", DepartmentType.DATA, "", "lead2", "Lead 2")
+    assert not (tmp_path / "departments" / "data.json").exists()
+
+    time.sleep(0.5)
+    with open(tmp_path / "departments" / "data.json", encoding="utf-8") as f:
+        assert json.load(f)["name"] == "数据部"
+
+
+def test_timer_saves_do_not_race_with_mutations(tmp_path, caplog):
+    system = _make_system(tmp_path, autosave_interval=0.001, autosave_every=10**9)
+    system.create_department("tech", "技术部", DepartmentType.TECHNOLOGY, "", "lead", "Lead")
+    position = Position("Dev", PositionLevel.JUNIOR, "", [], 10_000)
+    system.add_position_to_department("tech", position)
+
+    with caplog.at_level(logging.ERROR, logger="agent_department"):
+        for i in range(2000):
+            system.add_agent_to_department("tech", AgentInPosition(
+                agent_id=f"a{i}", agent_name=f"A{i}", position=position,
+                department_id="tech", skills=["python"]
+            ))
+        system.flush()
+    assert not [r for r in caplog.records if r.levelno >= logging.ERROR]
+
+    reloaded = _make_system(tmp_path)
+    assert len(reloaded.departments["tech"].positions["Dev"]) == 2000
+
+
+def test_department_system_can_be_collected(tmp_path):
+    system = _make_system(tmp_path)
+    system.create_department("tech", "技术部", DepartmentType.TECHNOLOGY, "", "lead", "Lead")
+    system.flush()
+    ref = weakref.ref(system)
+    del system
+    gc.collect()
+    assert ref() is None
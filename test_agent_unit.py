@@ -0,0 +1,107 @@
+"""
+UnitManager 状态索引测试
+"""
+
+from agent_unit import UnitManager, UnitMember, UnitRole, UnitStatus
+
+
+def _make_active_unit(tmp_path):
+    manager = UnitManager(storage_file=str(tmp_path / "units.json"))
+    lead = UnitMember("pm_001", "张三", UnitRole.LEAD, "pm_dept", "Senior PM")
+    unit = manager.create_unit("unit_a", "项目 A", "测试 Unit", lead)
+    assert manager.activate_unit("unit_a")
+    return manager, unit
+
+
+def test_pause_unit_updates_status_index(tmp_path):
+    manager, unit = _make_active_unit(tmp_path)
+    version = manager.version
+
+    assert unit.pause()
+
+    stats = manager.get_statistics()
+    assert stats["active_units"] == 0
+    assert stats["units_by_status"]["paused"] == 1
+    assert manager.list_units_by_status(UnitStatus.ACTIVE) == []
+    assert manager.list_units_by_status(UnitStatus.PAUSED) == [unit]
+    assert manager.version > version
+
+
+def test_pause_and_resume_through_manager(tmp_path):
+    manager, unit = _make_active_unit(tmp_path)
+
+    assert manager.pause_unit("unit_a")
+    assert manager.get_statistics()["units_by_status"]["paused"] == 1
+
+    assert manager.resume_unit("unit_a")
+    stats = manager.get_statistics()
+    assert stats["active_units"] == 1
+    assert stats["units_by_status"]["paused"] == 0
+    assert manager.list_units_by_status(UnitStatus.ACTIVE) == [unit]
+
+
+def test_status_change_is_saved(tmp_path):
+    manager, unit = _make_active_unit(tmp_path)
+    unit.pause()
+
+    reloaded = UnitManager(storage_file=manager.storage_file)
+    assert reloaded.get_unit("unit_a").status == UnitStatus.PAUSED
+    assert reloaded.list_units_by_status(UnitStatus.PAUSED)[0].id == "unit_a"
+
+
+def test_to_info_result_can_be_modified_safely(tmp_path):
+    manager, unit = _make_active_unit(tmp_path)
+    member = UnitMember("dev_001", "王五", UnitRole.EXECUTOR, "tech_dept", "Senior Developer")
+    manager.add_member_to_unit("unit_a", member, UnitRole.EXECUTOR)
+
+    info = unit.to_info()
+    info["name"] = "changed"
+    info["lead"]["agent_name"] = "changed"
+    info["executors"][0]["responsibilities"] = "changed"
+    info["executors"].append({})
+    info["member_count"]["total"] = 0
+
+    again = unit.to_info()
+    assert again["name"] == "项目 A"
+    assert again["lead"]["agent_name"] == "张三"
+    assert again["executors"] == [{
+        "agent_id": "dev_001",
+        "agent_name": "王五",
+        "department": "tech_dept",
+        "position": "Senior Developer",
+        "responsibilities": ""
+    }]
+    assert again["member_count"]["total"] == 2
+
+
+def test_to_dict_is_isolated_from_unit_state(tmp_path):
+    manager, unit = _make_active_unit(tmp_path)
+    manager.assign_task_to_unit("unit_a", "task_1", "任务 1")
+
+    data = unit.to_dict()
+    data["tasks"].append({"task_id": "bogus"})
+    data["tasks"][0]["status"] = "changed"
+    data["lead_member"]["skills"].append("bogus")
+    assert len(unit.tasks) == 1
+    assert unit.tasks[0]["status"] == "assigned"
+    assert unit.lead_member.skills == []
+    assert unit.to_dict()["tasks"][0]["status"] == "assigned"
+
+
+def test_member_change_invalidates_cached_dicts(tmp_path):
+    manager, unit = _make_active_unit(tmp_path)
+    member = UnitMember("dev_001", "王五", UnitRole.EXECUTOR, "tech_dept", "Senior Developer")
+    manager.add_member_to_unit("unit_a", member, UnitRole.EXECUTOR)
+    unit.to_dict(), unit.to_info()
+
+    member.responsibilities = "核心开发"
+    unit.lead_member.agent_name = "张三 (PM)"
+    assert unit.to_dict()["executor_members"]["dev_001"]["responsibilities"] == "核心开发"
+    assert unit.to_info()["executors"][0]["responsibilities"] == "核心开发"
+    assert unit.to_dict()["lead_member"]["agent_name"] == "张三 (PM)"
+
+    # 重新加载（msgspec 解码）后成员回调同样生效
+    reloaded = UnitManager(storage_file=manager.storage_file).get_unit("unit_a")
+    reloaded.to_dict()
+    reloaded.executor_members["dev_001"].responsibilities = "架构设计"
+    assert reloaded.to_dict()["executor_members"]["dev_001"]["responsibilities"] == "架构设计"
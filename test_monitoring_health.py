@@ -0,0 +1,75 @@
+"""
+批量健康评分与逐个评分的一致性测试
+"""
+
+import math
+
+import pytest
+
+from monitoring_specialist_agent import (
+    MetricsBatch, _health_scores_kernel, _score_health, compute_health_scores,
+    compute_health_scores_vec, np
+)
+
+pytestmark = pytest.mark.skipif(np is None, reason="需要 numpy")
+
+
+def _around(threshold):
+    """阈值本身及紧邻的上下两个 float64"""
+    return [math.nextafter(threshold, -math.inf), threshold, math.nextafter(threshold, math.inf)]
+
+
+def _boundary_metrics():
+    metrics = []
+    for er in _around(0.05) + _around(0.01) + [0.0500000005, 0.0100000001]:
+        metrics.append({"error_rate": er, "avg_latency": 0.0, "success_rate": 1.0})
+    for lat in _around(5000.0) + _around(2000.0):
+        metrics.append({"error_rate": 0.0, "avg_latency": lat, "success_rate": 1.0})
+    for sr in _around(0.95) + [0.9499999995]:
+        metrics.append({"error_rate": 0.0, "avg_latency": 0.0, "success_rate": sr})
+    return metrics
+
+
+def test_vectorized_scores_match_scalar_near_thresholds():
+    metrics = _boundary_metrics()
+    system_ids = [f"sys_{i}" for i in range(len(metrics))]
+    expected = [_score_health(m)[0] for m in metrics]
+
+    batch = MetricsBatch.from_metrics(system_ids, metrics)
+    assert compute_health_scores_vec(batch).tolist() == expected
+    assert compute_health_scores(system_ids, metrics) == dict(zip(system_ids, expected))
+    kernel = _health_scores_kernel(batch.error_rate, batch.avg_latency, batch.success_rate)
+    assert kernel.tolist() == expected
+
+
+def test_large_total_requests_do_not_overflow():
+    metrics = [{"total_requests": 2**31 + 5, "error_rate": 0.0, "avg_latency": 0.0, "success_rate": 1.0}]
+    batch = MetricsBatch.from_metrics(["big"], metrics)
+    assert batch.total_requests[0] == 2**31 + 5
+    assert compute_health_scores(["big"], metrics) == {"big": 100}
+
+
+@pytest.mark.parametrize("missing", ["error_rate", "avg_latency", "success_rate"])
+def test_missing_metric_scored_the_same_by_both_paths(missing):
+    metrics = {"error_rate": 0.02, "avg_latency": 3000.0, "success_rate": 0.99}
+    del metrics[missing]
+    expected = _score_health(metrics)[0]
+    assert compute_health_scores(["sys"], [metrics]) == {"sys": expected}
+
+
+def test_numba_kernel_matches_python_kernel():
+    pytest.importorskip("numba")
+    metrics = _boundary_metrics()
+    batch = MetricsBatch.from_metrics([str(i) for i in range(len(metrics))], metrics)
+    assert hasattr(_health_scores_kernel, "py_func"), "有 numba 时内核应已 JIT 编译"
+    args = (batch.error_rate, batch.avg_latency, batch.success_rate)
+    expected = [_score_health(m)[0] for m in metrics]
+    assert _health_scores_kernel(*args).tolist() == expected
+    assert _health_scores_kernel.py_func(*args).tolist() == expected
+
+
+def test_numpy_path_matches_scalar_when_numba_disabled(monkeypatch):
+    monkeypatch.setattr("monitoring_specialist_agent.njit", None)
+    metrics = _boundary_metrics()
+    batch = MetricsBatch.from_metrics([str(i) for i in range(len(metrics))], metrics)
+    assert compute_health_scores_vec(batch).tolist() == [_score_health(m)[0] for m in metrics]
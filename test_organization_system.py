@@ -0,0 +1,69 @@
+"""
+OrganizationSystem 测试（部门 / Unit 数据写入临时目录）
+"""
+
+import pytest
+
+from agent_department import DepartmentSystem, DepartmentType
+from agent_unit import UnitManager
+from organization_system import OrganizationSystem
+
+
+@pytest.fixture
+def org(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "organization_system.DepartmentSystem",
+        lambda: DepartmentSystem(storage_dir=str(tmp_path / "departments"), storage_file=str(tmp_path / "none.json"))
+    )
+    monkeypatch.setattr(
+        "organization_system.UnitManager",
+        lambda: UnitManager(storage_file=str(tmp_path / "units.json"))
+    )
+    return OrganizationSystem()
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+@pytest.mark.parametrize("dept_type", [DepartmentType.TECHNOLOGY, "technology"])
+def test_create_department_with_positions_accepts_type_value(org, dept_type):
+    dept = org.create_department_with_positions(
+        "tech_dept", "技术部", dept_type, "技术研发", "tech_lead", "技术负责人",
+        position_names=["Senior Developer", "Junior Developer"]
+    )
+    assert dept.type is DepartmentType.TECHNOLOGY
+    assert list(dept.positions) == ["Senior Developer", "Junior Developer"]
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_create_department_rejects_unknown_type(org):
+    with pytest.raises(ValueError):
+        org.create_department_with_positions(
+            "x_dept", "X", "no_such_type", "", "lead", "Lead"
+        )
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_organization_status_result_can_be_modified_safely(org):
+    org.create_department_with_positions(
+        "tech_dept", "技术部", DepartmentType.TECHNOLOGY, "技术研发", "tech_lead", "技术负责人"
+    )
+    status = org.get_organization_status()
+    status["departments"]["departments"]["tech_dept"]["name"] = "changed"
+    status["units"]["units_by_status"]["active"] = 99
+    status["summary"]["total_departments"] = 0
+
+    again = org.get_organization_status()
+    assert again["departments"]["departments"]["tech_dept"]["name"] == "技术部"
+    assert again["units"]["units_by_status"]["active"] == 0
+    assert again["summary"]["total_departments"] == 1
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_list_departments_returns_position_list(org):
+    org.create_department_with_positions(
+        "tech_dept", "技术部", DepartmentType.TECHNOLOGY, "技术研发", "tech_lead", "技术负责人",
+        position_names=["Senior Developer"]
+    )
+    positions = org.list_departments()[0]["positions"]
+    assert positions == ["Senior Developer"]
+    positions.append("changed")
+    assert org.list_departments()[0]["positions"] == ["Senior Developer"]
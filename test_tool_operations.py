@@ -0,0 +1,99 @@
+"""
+OperationLogger 日志写入测试
+"""
+
+import pytest
+import requests
+
+from tool_operations_specialist import (
+    OperationLogger, OperationRecord, OperationStatus, OperationType, ToolOperationsSpecialist,
+    read_operation_log
+)
+
+
+def _record(i, parameters=None):
+    return OperationRecord(
+        operation_id=f"op_{i}",
+        tool_name="langfuse",
+        operation_type=OperationType.READ,
+        command="list_projects",
+        parameters=parameters if parameters is not None else {"i": i},
+        status=OperationStatus.SUCCESS
+    )
+
+
+def test_unserializable_record_does_not_drop_batch(tmp_path):
+    log_file = str(tmp_path / "ops.jsonl")
+    op_logger = OperationLogger(log_file=log_file)
+    for i in range(5):
+        op_logger.log_operation(_record(i, {"tags": {"a", "b"}} if i == 2 else None))
+    op_logger.close()
+
+    written = [d["operation_id"] for d in read_operation_log(log_file)]
+    assert written == ["op_0", "op_1", "op_3", "op_4"]
+
+
+def test_unserializable_record_skipped_within_one_batch(tmp_path):
+    log_file = str(tmp_path / "ops.jsonl")
+    op_logger = OperationLogger(log_file=log_file)
+    batch = [
+        _record(i, {"tags": {"a", "b"}} if i == 2 else None)._cached_dict()
+        for i in range(5)
+    ]
+    # 直接写入同一批，不依赖后台线程如何分批
+    op_logger._log_writer._write_batch(batch)
+    op_logger.close()
+
+    written = [d["operation_id"] for d in read_operation_log(log_file)]
+    assert written == ["op_0", "op_1", "op_3", "op_4"]
+
+
+def _failing_handler(exc, calls):
+    def handler(command, parameters):
+        calls.append(command)
+        raise exc
+    return handler
+
+
+def _http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.HTTPError(f"{status_code} error", response=response)
+
+
+@pytest.fixture
+def specialist(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("tool_operations_specialist.random.uniform", lambda a, b: 0)
+    agent = ToolOperationsSpecialist(max_retries=3)
+    yield agent
+    agent.logger.close()
+
+
+@pytest.mark.parametrize("exc", [
+    ValueError("Unknown Langfuse command: nope"),
+    _http_error(404),
+    _http_error(401),
+])
+def test_deterministic_errors_are_not_retried(specialist, exc):
+    calls = []
+    specialist._handlers["langfuse"] = _failing_handler(exc, calls)
+    record = specialist.execute_operation("langfuse", OperationType.EXECUTE, "nope", {})
+    assert record.status == OperationStatus.FAILED
+    assert record.retry_count == 0
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("exc", [
+    requests.ConnectionError("refused"),
+    requests.Timeout("timed out"),
+    _http_error(503),
+    _http_error(429),
+])
+def test_transient_errors_are_retried(specialist, exc):
+    calls = []
+    specialist._handlers["langfuse"] = _failing_handler(exc, calls)
+    record = specialist.execute_operation("langfuse", OperationType.EXECUTE, "list_projects", {})
+    assert record.status == OperationStatus.FAILED
+    assert record.retry_count == 3
+    assert len(calls) == 4
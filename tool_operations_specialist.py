@@ -3,15 +3,51 @@ Tool Operations Specialist Agent
 工具操作专家 Agent - 负责与各种工具交互，记录每次操作
 """
 
+import asyncio
+import glob
+import gzip
+import itertools
 import os
 import json
+import queue
+import random
+import shutil
+import struct
+import threading
+import time
+import uuid
+import weakref
 import requests
+from requests.adapters import HTTPAdapter
+from collections import Counter, OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
 
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时回退到标准库 json
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # 未安装 msgspec 时只支持 JSONL 格式
+    msgspec = None
+
+
+# 日志在模块导入时配置一次：格式预先编译，FileHandler 延迟到第一条记录时才打开文件
+logger = logging.getLogger("ToolOperations")
+logger.setLevel(logging.INFO)
+_log_handler = logging.FileHandler("tool_operations.log", encoding="utf-8", delay=True)
+_log_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+logger.addHandler(_log_handler)
+
 
 # ============= Agent 职能定义 =============
 class ToolOperationsRole:
@@ -68,7 +104,7 @@ class OperationStatus(Enum):
     RETRYING = "retrying"
 
 
-@dataclass
+@dataclass(slots=True)
 class OperationRecord:
     """操作记录"""
     operation_id: str
@@ -86,9 +122,23 @@ class OperationRecord:
     retry_count: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    # _cached_dict() 结果缓存，任一字段被重新赋值时失效
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
+    
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        return {
+        """转换为字典（返回缓存的浅拷贝，调用方修改不会影响日志写入和后续结果）"""
+        return dict(self._cached_dict())
+    
+    def _cached_dict(self) -> Dict[str, Any]:
+        """内部使用的字典（未修改时复用同一对象，调用方不得修改）"""
+        if self._dict_cache is not None:
+            return self._dict_cache
+        self._dict_cache = {
             "operation_id": self.operation_id,
             "tool_name": self.tool_name,
             "operation_type": self.operation_type.value,
@@ -104,55 +154,449 @@ class OperationRecord:
             "retry_count": self.retry_count,
             "metadata": self.metadata
         }
+        return self._dict_cache
 
 
 # ============= 操作日志管理器 =============
+# OperationLogger 支持的 fsync 策略
+_SYNC_POLICIES = ("never", "batch", "every")
+# macOS 等平台没有 fdatasync，退回 fsync
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# 后台线程每次最多合并写入的记录数
+_WRITE_BATCH = 256
+# 日志文件的用户态缓冲区大小；一批记录超过它时改用 writev 直接写 fd
+_FILE_BUFFER = 1 << 16
+# Windows 没有 os.writev，始终拼接后 write
+_HAS_WRITEV = hasattr(os, "writev")
+_IOV_MAX = os.sysconf("SC_IOV_MAX") if hasattr(os, "sysconf") else 1024
+# 轮转日志用最快的 gzip 级别压缩：JSONL 重复键名多，级别 1 已能压缩数倍，CPU 开销小
+_ROTATE_COMPRESSLEVEL = 1
+
+
+def _writev_all(fd: int, parts: List[bytes]):
+    """用 writev 写出全部片段，处理部分写入和 IOV_MAX 限制"""
+    while parts:
+        chunk = parts[:_IOV_MAX]
+        written = os.writev(fd, chunk)
+        # 跳过已完整写出的片段，剩余片段截掉已写部分后继续
+        for i, part in enumerate(chunk):
+            if written < len(part):
+                parts = [part[written:]] + parts[i + 1:] if written else parts[i:]
+                break
+            written -= len(part)
+        else:
+            parts = parts[len(chunk):]
+
+
+def _dumps_line(data: Dict[str, Any]) -> bytes:
+    """序列化为一行 JSONL（bytes，含换行）"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # orjson 不支持的值（如超出 64 位的整数）交给标准库处理
+    return (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder() if msgspec is not None else None
+_FRAME_HEADER = struct.Struct('<I')  # msgpack 日志每条记录前的 4 字节小端长度
+
+
+def _pack_frame(data: Dict[str, Any]) -> bytes:
+    """序列化为一条带长度前缀的 MessagePack 记录"""
+    buf = _MSGPACK_ENCODER.encode(data)
+    return _FRAME_HEADER.pack(len(buf)) + buf
+
+
+def read_operation_log(path: str, log_format: str = "jsonl") -> Iterator[Dict[str, Any]]:
+    """逐条读取 OperationLogger 写出的日志文件（jsonl / msgpack，轮转后的 .gz 文件也可直接读取）"""
+    opener = gzip.open if path.endswith(".gz") else open
+    if log_format == "jsonl":
+        with opener(path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line) if orjson is not None else json.loads(line)
+        return
+    
+    if msgspec is None:
+        raise RuntimeError("Reading msgpack operation logs requires msgspec")
+    decoder = msgspec.msgpack.Decoder()
+    header_size = _FRAME_HEADER.size
+    with opener(path, 'rb') as f:
+        while True:
+            header = f.read(header_size)
+            if len(header) < header_size:
+                return
+            (length,) = _FRAME_HEADER.unpack(header)
+            yield decoder.decode(f.read(length))
+
+
+class _OperationLogWriter:
+    """操作日志文件写入器：后台线程批量序列化、写入、落盘和轮转
+    
+    与 OperationLogger 分开，使退出清理（weakref.finalize）只引用写入器，
+    不会让 OperationLogger 本身常驻内存
+    """
+    
+    def __init__(
+        self,
+        log_file: str,
+        flush_every: int,
+        flush_interval: float,
+        queue_size: int,
+        log_format: str,
+        sync_policy: str,
+        sync_every: int,
+        max_bytes: int,
+        compress_rotated: bool
+    ):
+        self.log_file = log_file
+        # 日志文件超过 max_bytes（0 表示不轮转）时轮转为 <log_file>.N(.gz)
+        self.max_bytes = max_bytes
+        self.compress_rotated = compress_rotated
+        self._bytes_written = 0
+        self._rotation_index: Optional[int] = None
+        # fsync 策略: "never" 交给操作系统；"batch" 每写入 sync_every 条同步一次；
+        # "every" 每次写入一批后都同步。commit() / close() 时（"never" 除外）总会同步
+        if sync_policy not in _SYNC_POLICIES:
+            raise ValueError(f"Unsupported sync policy: {sync_policy}")
+        self.sync_policy = sync_policy
+        self.sync_every = sync_every
+        self._unsynced = 0
+        # 日志文件格式: "jsonl"（默认，便于查看）或 "msgpack"（带长度前缀的二进制记录，体积更小、编码更快）
+        if log_format == "jsonl":
+            self._encode = _dumps_line
+        elif log_format == "msgpack":
+            if msgspec is None:
+                raise RuntimeError("The msgpack log format requires msgspec")
+            self._encode = _pack_frame
+        else:
+            raise ValueError(f"Unsupported log format: {log_format}")
+        self.log_format = log_format
+        
+        # 日志文件只打开一次（首次写入时），写入先进缓冲区：
+        # 累计 flush_every 条或距上次落盘超过 flush_interval 秒才 flush
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._fh = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._file_lock = threading.Lock()
+        
+        # 序列化和写文件交给后台线程，调用方只需入队；队列满时退回同步写入
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._drain, name="OperationLogWriter", daemon=True)
+        self._thread.start()
+    
+    def submit(self, data: Dict[str, Any]):
+        """提交一条记录（入队，由后台线程批量写入；线程已停止或队列已满时同步写入）"""
+        if self._thread is None:
+            self._write_batch([data])
+        else:
+            try:
+                self._queue.put_nowait(data)
+            except queue.Full:
+                self._write_batch([data])
+    
+    def _drain(self):
+        """后台写入线程：一次取出最多 _WRITE_BATCH 条，合并为一次 write"""
+        q = self._queue
+        while True:
+            try:
+                item = q.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # 空闲时把缓冲区中剩余的日志落盘
+                self._flush_file()
+                continue
+            
+            batch = []
+            stop = item is None
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < _WRITE_BATCH:
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+            
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    logger.error("❌ 写入操作日志失败: %s", e)
+            for _ in range(len(batch) + stop):
+                q.task_done()
+            if stop:
+                return
+    
+    def _encode_batch(self, batch: List[Dict[str, Any]]) -> List[bytes]:
+        """逐条序列化；无法序列化的记录记日志后跳过，不影响同一批的其他记录"""
+        encode = self._encode
+        parts = []
+        for data in batch:
+            try:
+                parts.append(encode(data))
+            except Exception as e:
+                logger.error("❌ 序列化操作记录 %s 失败，已跳过: %s", data.get("operation_id"), e)
+        return parts
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        """序列化并写入一批记录，按条数 / 时间决定是否落盘"""
+        parts = self._encode_batch(batch)
+        if not parts:
+            return
+        size = sum(map(len, parts))
+        rotated = None
+        with self._file_lock:
+            if self._fh is None:
+                self._fh = open(self.log_file, 'ab', buffering=_FILE_BUFFER)
+                self._bytes_written = self._fh.tell()
+            self._bytes_written += size
+            if _HAS_WRITEV and len(parts) > 1 and size >= _FILE_BUFFER:
+                # 大批量：先清空缓冲区保证顺序，再把各条记录交给 writev，省去拼接时的整批拷贝
+                self._fh.flush()
+                _writev_all(self._fh.fileno(), parts)
+                self._pending = 0
+                self._last_flush = time.monotonic()
+            else:
+                self._fh.write(b"".join(parts))
+                self._pending += len(parts)
+            self._unsynced += len(parts)
+            if self.sync_policy == "every" or (
+                self.sync_policy == "batch" and self._unsynced >= self.sync_every
+            ):
+                self._sync_locked()
+            elif (
+                self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._flush_locked()
+            if self.max_bytes and self._bytes_written >= self.max_bytes:
+                rotated = self._rotate_locked()
+        # 压缩较慢，放在锁外进行，不阻塞新日志写入
+        if rotated is not None and self.compress_rotated:
+            self._compress_rotated(rotated)
+    
+    def _next_rotation_index(self) -> int:
+        """下一个轮转文件编号（首次轮转时根据已有文件确定）"""
+        if self._rotation_index is None:
+            used = [0]
+            for name in glob.glob(glob.escape(self.log_file) + ".*"):
+                suffix = name[len(self.log_file) + 1:]
+                if suffix.endswith(".gz"):
+                    suffix = suffix[:-3]
+                if suffix.isdigit():
+                    used.append(int(suffix))
+            self._rotation_index = max(used)
+        self._rotation_index += 1
+        return self._rotation_index
+    
+    def _rotate_locked(self) -> str:
+        """关闭当前日志文件并改名为 <log_file>.N，下次写入时重新创建（调用方已持有 _file_lock）"""
+        if self.sync_policy == "never":
+            self._flush_locked()
+        else:
+            self._sync_locked()
+        self._fh.close()
+        self._fh = None
+        self._bytes_written = 0
+        rotated = f"{self.log_file}.{self._next_rotation_index()}"
+        os.replace(self.log_file, rotated)
+        return rotated
+    
+    def _compress_rotated(self, path: str):
+        """把轮转出的日志流式压缩为 <path>.gz 并删除原文件"""
+        try:
+            with open(path, 'rb') as src, gzip.open(
+                path + ".gz", 'wb', compresslevel=_ROTATE_COMPRESSLEVEL
+            ) as dst:
+                shutil.copyfileobj(src, dst, _FILE_BUFFER)
+            os.remove(path)
+        except OSError as e:
+            logger.error("❌ 压缩轮转日志失败: %s", e)
+    
+    def _flush_locked(self):
+        """将文件缓冲区写入磁盘（调用方已持有 _file_lock）"""
+        if self._fh is not None and self._pending:
+            self._fh.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+    
+    def _sync_locked(self):
+        """落盘并 fsync，确保已写入的记录在断电后也不丢失（调用方已持有 _file_lock）"""
+        self._flush_locked()
+        if self._fh is not None and self._unsynced:
+            _fdatasync(self._fh.fileno())
+        self._unsynced = 0
+    
+    def _flush_file(self):
+        """将文件缓冲区写入磁盘"""
+        with self._file_lock:
+            self._flush_locked()
+    
+    def flush(self):
+        """等待已入队的日志写完并落盘"""
+        if self._thread is not None:
+            self._queue.join()
+        self._flush_file()
+    
+    def commit(self):
+        """检查点：等待已入队的日志写完，并 fsync 到磁盘（"never" 策略下只落盘）"""
+        if self._thread is not None:
+            self._queue.join()
+        with self._file_lock:
+            if self.sync_policy == "never":
+                self._flush_locked()
+            else:
+                self._sync_locked()
+    
+    def close(self):
+        """写完队列中剩余的日志，停止后台线程并关闭日志文件"""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+            # 线程退出前后仍可能有记录入队，同步写完
+            leftover = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    leftover.append(item)
+                self._queue.task_done()
+            if leftover:
+                self._write_batch(leftover)
+        with self._file_lock:
+            if self._fh is not None:
+                if self.sync_policy == "never":
+                    self._flush_locked()
+                else:
+                    self._sync_locked()
+                self._fh.close()
+                self._fh = None
+
+
 class OperationLogger:
     """操作日志管理器"""
     
-    def __init__(self, log_file: str = "tool_operations.jsonl"):
+    def __init__(
+        self,
+        log_file: str = "tool_operations.jsonl",
+        flush_every: int = 100,
+        flush_interval: float = 0.25,
+        queue_size: int = 10000,
+        max_records: int = 10000,
+        log_format: str = "jsonl",
+        sync_policy: str = "batch",
+        sync_every: int = 100,
+        max_bytes: int = 64 * 1024 * 1024,
+        compress_rotated: bool = True
+    ):
         self.log_file = log_file
-        self.operations: List[OperationRecord] = []
+        self.log_format = log_format
+        # 内存中只保留最近 max_records 条（完整记录已写入日志文件）
+        self.operations: Deque[OperationRecord] = deque(maxlen=max_records)
         
-        # 设置日志
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        # 按工具 / 状态的最近记录索引，查询时无需遍历全部记录
+        new_index = partial(deque, maxlen=max_records)
+        self._by_tool: Dict[str, Deque[OperationRecord]] = defaultdict(new_index)
+        self._by_status: Dict[OperationStatus, Deque[OperationRecord]] = defaultdict(new_index)
+        # 累计统计只增不减，不受内存中记录被淘汰的影响
+        self._total = 0
+        self._status_counts: Counter = Counter()
+        self._duration_sum = 0.0
+        self._duration_count = 0
+        self._index_lock = threading.Lock()  # 并发执行操作时保护索引和统计
+        
+        # 写文件交给 _OperationLogWriter；本对象被回收或进程退出时通过 finalize 关闭写入器
+        self._log_writer = _OperationLogWriter(
+            log_file, flush_every, flush_interval, queue_size, log_format,
+            sync_policy, sync_every, max_bytes, compress_rotated
         )
-        self.logger = logging.getLogger("ToolOperations")
+        self._finalizer = weakref.finalize(self, self._log_writer.close)
+        
+        self.logger = logger
     
     def log_operation(self, record: OperationRecord):
         """记录操作"""
-        self.operations.append(record)
+        with self._index_lock:
+            self.operations.append(record)
+            self._by_tool[record.tool_name].append(record)
+            self._by_status[record.status].append(record)
+            self._total += 1
+            self._status_counts[record.status] += 1
+            if record.duration_ms:
+                self._duration_sum += record.duration_ms
+                self._duration_count += 1
         
         # 写入文件
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(record.to_dict(), ensure_ascii=False) + '\n')
+        self._log_writer.submit(record._cached_dict())
         
         # 打印日志
         self.logger.info(
-            f"[{record.tool_name}] {record.operation_type.value} - "
-            f"{record.command} - {record.status.value}"
+            "[%s] %s - %s - %s",
+            record.tool_name, record.operation_type.value,
+            record.command, record.status.value
         )
     
+    def flush(self):
+        """等待已入队的日志写完并落盘"""
+        self._log_writer.flush()
+    
+    def commit(self):
+        """检查点：等待已入队的日志写完，并 fsync 到磁盘（"never" 策略下只落盘）"""
+        self._log_writer.commit()
+    
+    def close(self):
+        """写完剩余日志并关闭日志文件（只执行一次，同时取消退出时的清理）"""
+        self._finalizer()
+    
     def get_operations_by_tool(self, tool_name: str) -> List[OperationRecord]:
         """获取特定工具的操作记录"""
-        return [op for op in self.operations if op.tool_name == tool_name]
+        return list(self._by_tool.get(tool_name, ()))
     
     def get_failed_operations(self) -> List[OperationRecord]:
         """获取失败的操作"""
-        return [op for op in self.operations if op.status == OperationStatus.FAILED]
+        return list(self._by_status.get(OperationStatus.FAILED, ()))
+    
+    def get_recent_operations(
+        self,
+        tool_name: Optional[str] = None,
+        status: Optional[OperationStatus] = None,
+        limit: int = 100
+    ) -> List[OperationRecord]:
+        """按工具 / 状态过滤后的最近 limit 条记录（按记录顺序）"""
+        if tool_name:
+            operations = self._by_tool.get(tool_name, ())
+        elif status:
+            operations = self._by_status.get(status, ())
+        else:
+            operations = self.operations
+        
+        # 从末尾往前取，凑够 limit 条即停（limit <= 0 时取全部）
+        matches = reversed(operations)
+        if tool_name and status:
+            matches = (op for op in matches if op.status == status)
+        if limit > 0:
+            matches = itertools.islice(matches, limit)
+        return list(matches)[::-1]
     
     def get_operation_stats(self) -> Dict[str, Any]:
         """获取操作统计"""
-        total = len(self.operations)
-        success = len([op for op in self.operations if op.status == OperationStatus.SUCCESS])
-        failed = len([op for op in self.operations if op.status == OperationStatus.FAILED])
+        total = self._total
+        success = self._status_counts[OperationStatus.SUCCESS]
+        failed = self._status_counts[OperationStatus.FAILED]
         
         avg_duration = 0
-        if self.operations:
-            durations = [op.duration_ms for op in self.operations if op.duration_ms]
-            avg_duration = sum(durations) / len(durations) if durations else 0
+        if self._duration_count:
+            avg_duration = self._duration_sum / self._duration_count
         
         return {
             "total_operations": total,
@@ -160,19 +604,68 @@ class OperationLogger:
             "failed_count": failed,
             "success_rate": success / total if total > 0 else 0,
             "avg_duration_ms": avg_duration,
-            "tools_used": list(set([op.tool_name for op in self.operations]))
+            "tools_used": list(self._by_tool)
         }
 
 
 # ============= 工具操作执行器 =============
+# 重试退避: 第 n 次重试前最多等待 min(_RETRY_BACKOFF_BASE * 2**n, _RETRY_BACKOFF_MAX) 秒
+_RETRY_BACKOFF_BASE = 0.1
+_RETRY_BACKOFF_MAX = 5.0
+# 只有这些 HTTP 状态码（及 5xx）视为临时错误，可以重试
+_RETRYABLE_STATUS_CODES = frozenset((408, 429))
+
+
+def _is_transient_error(exc: Exception) -> bool:
+    """连接错误、超时、429 / 5xx 响应可重试；未知命令、4xx 等确定性错误重试也不会成功"""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        status_code = exc.response.status_code
+        return status_code >= 500 or status_code in _RETRYABLE_STATUS_CODES
+    return False
+
+# 可以缓存结果的操作类型（只读）
+_CACHEABLE_OPERATION_TYPES = frozenset((OperationType.READ, OperationType.QUERY))
+
+# 各工具支持的命令: command -> (路径模板, 路径参数, {查询参数: 默认值})
+_LANGFUSE_ROUTES = {
+    "get_projects": ("/api/projects", (), {}),
+    "get_project_stats": ("/api/projects/{project_id}/stats", ("project_id",), {}),
+    "get_traces": ("/api/projects/{project_id}/traces", ("project_id",), {"limit": 10}),
+}
+
+_GITHUB_ROUTES = {
+    "get_repos": ("/user/repos", (), {}),
+    "get_repo": ("/repos/{owner}/{repo}", ("owner", "repo"), {}),
+}
+
+# tool_name -> (错误信息中的名称, 路由表)
+_TOOL_ROUTES = {
+    "langfuse": ("Langfuse", _LANGFUSE_ROUTES),
+    "github": ("GitHub", _GITHUB_ROUTES),
+}
+
+
 class ToolOperationsSpecialist:
     """工具操作专家 Agent"""
     
-    def __init__(self, max_retries: int = 3):
+    def __init__(self, max_retries: int = 3, cache_ttl: float = 30.0, cache_maxsize: int = 512):
         self.role = ToolOperationsRole()
         self.logger = OperationLogger()
         self.max_retries = max_retries
         
+        # READ / QUERY 操作的结果缓存: (tool, command, 参数) -> (过期时间, 响应)，按 LRU 淘汰；
+        # cache_ttl <= 0 时不缓存。写类操作从不缓存
+        self.cache_ttl = cache_ttl
+        self.cache_maxsize = cache_maxsize
+        self._read_cache: "OrderedDict[tuple, Tuple[float, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._op_counter = itertools.count()  # 操作编号
+        self._handlers = {
+            tool_name: partial(self._execute_route, tool_name) for tool_name in _TOOL_ROUTES
+        }
+        
         # 工具配置
         self.tool_configs = {
             "langfuse": {
@@ -185,6 +678,21 @@ class ToolOperationsSpecialist:
                 "token": os.getenv("GITHUB_TOKEN", "")
             }
         }
+        
+        # 每个工具一个长连接 Session（keep-alive + 连接池），认证信息只设置一次；
+        # 重试由 execute_operation 负责，适配器本身不重试
+        self._sessions: Dict[str, requests.Session] = {}
+        for tool_name in self.tool_configs:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._sessions[tool_name] = session
+        langfuse_config = self.tool_configs["langfuse"]
+        self._sessions["langfuse"].auth = (langfuse_config["api_key"], langfuse_config["secret_key"])
+        self._sessions["github"].headers.update(
+            {"Authorization": f"token {self.tool_configs['github']['token']}"}
+        )
     
     def execute_operation(
         self,
@@ -196,122 +704,173 @@ class ToolOperationsSpecialist:
     ) -> OperationRecord:
         """执行工具操作"""
         
-        # 生成操作 ID
-        operation_id = f"{tool_name}_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+        # 生成操作 ID（序号 + 随机后缀，并发或同一微秒内也不会重复）
+        operation_id = f"{tool_name}_{next(self._op_counter)}_{uuid.uuid4().hex[:8]}"
         
-        # 创建操作记录
+        # 创建操作记录（start_time 即开始时间）；耗时用单调时钟计算
+        start_ns = time.perf_counter_ns()
         record = OperationRecord(
             operation_id=operation_id,
             tool_name=tool_name,
             operation_type=operation_type,
             command=command,
             parameters=parameters,
-            status=OperationStatus.PENDING
+            status=OperationStatus.IN_PROGRESS
         )
         
-        # 记录开始时间
-        record.start_time = datetime.now()
-        record.status = OperationStatus.IN_PROGRESS
-        
-        try:
-            # 执行具体操作
-            if tool_name == "langfuse":
-                result = self._execute_langfuse_operation(command, parameters)
-            elif tool_name == "github":
-                result = self._execute_github_operation(command, parameters)
-            else:
-                raise ValueError(f"Unsupported tool: {tool_name}")
-            
-            # 记录成功
+        # 只读操作先查缓存，命中时不发请求
+        cache_key = self._cache_key(tool_name, operation_type, command, parameters)
+        cached = self._cache_get(cache_key) if cache_key is not None else None
+        if cached is not None:
             record.status = OperationStatus.SUCCESS
-            record.response_data = result
-            record.end_time = datetime.now()
-            record.duration_ms = (record.end_time - record.start_time).total_seconds() * 1000
+            record.response_data = cached
+            record.metadata["cache_hit"] = True
+        else:
+            handler = self._handlers.get(tool_name)
             
-        except Exception as e:
-            # 记录失败
-            record.status = OperationStatus.FAILED
-            record.error_message = str(e)
-            record.end_time = datetime.now()
-            record.duration_ms = (record.end_time - record.start_time).total_seconds() * 1000
+            # 临时错误按指数退避（带随机抖动）重试，最多 max_retries 次；其他错误立即失败。
+            # 整个过程只记录一条操作记录
+            for attempt in range(self.max_retries + 1):
+                try:
+                    if handler is None:
+                        raise ValueError(f"Unsupported tool: {tool_name}")
+                    result = handler(command, parameters)
+                except Exception as e:
+                    record.error_message = str(e)
+                    if attempt >= self.max_retries or not _is_transient_error(e):
+                        record.status = OperationStatus.FAILED
+                        break
+                    record.retry_count = attempt + 1
+                    record.status = OperationStatus.RETRYING
+                    self.logger.logger.debug(
+                        "[%s] %s 第 %d 次失败，准备重试: %s", tool_name, command, attempt + 1, e
+                    )
+                    delay = min(_RETRY_BACKOFF_BASE * 2 ** attempt, _RETRY_BACKOFF_MAX)
+                    time.sleep(random.uniform(0, delay))
+                else:
+                    # 记录成功
+                    record.status = OperationStatus.SUCCESS
+                    record.response_data = result
+                    record.error_message = None
+                    break
             
-            # 尝试重试
-            if record.retry_count < self.max_retries:
-                record.retry_count += 1
-                record.status = OperationStatus.RETRYING
-                self.logger.log_operation(record)
-                return self.execute_operation(tool_name, operation_type, command, parameters, **kwargs)
+            if record.status == OperationStatus.SUCCESS and cache_key is not None:
+                self._cache_put(cache_key, record.response_data)
+        
+        record.end_time = datetime.now()
+        record.duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
         
         # 记录操作
         self.logger.log_operation(record)
         
         return record
     
-    def _execute_langfuse_operation(self, command: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        """执行 Langfuse 操作"""
-        config = self.tool_configs["langfuse"]
-        
-        if command == "get_projects":
-            response = requests.get(
-                f"{config['base_url']}/api/projects",
-                auth=(config['api_key'], config['secret_key']),
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
+    def _cache_key(
+        self,
+        tool_name: str,
+        operation_type: OperationType,
+        command: str,
+        parameters: Dict[str, Any]
+    ) -> Optional[tuple]:
+        """只读操作的缓存键；不可缓存（写类操作、参数不可哈希）时返回 None"""
+        if self.cache_ttl <= 0 or operation_type not in _CACHEABLE_OPERATION_TYPES:
+            return None
+        try:
+            key = (tool_name, command, tuple(sorted(parameters.items())))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def _cache_get(self, key: tuple) -> Any:
+        """取未过期的缓存响应，没有时返回 None"""
+        with self._cache_lock:
+            entry = self._read_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._read_cache[key]
+                return None
+            self._read_cache.move_to_end(key)
+            return entry[1]
+    
+    def _cache_put(self, key: tuple, data: Any):
+        """写入缓存，超出 cache_maxsize 时淘汰最久未使用的条目"""
+        with self._cache_lock:
+            self._read_cache[key] = (time.monotonic() + self.cache_ttl, data)
+            self._read_cache.move_to_end(key)
+            while len(self._read_cache) > self.cache_maxsize:
+                self._read_cache.popitem(last=False)
+    
+    def clear_cache(self):
+        """清空只读操作缓存"""
+        with self._cache_lock:
+            self._read_cache.clear()
+    
+    def execute_operations(
+        self,
+        ops: List[Tuple[str, OperationType, str, Dict[str, Any]]],
+        max_concurrency: int = 10
+    ) -> List[OperationRecord]:
+        """并发执行一批相互独立的操作，按传入顺序返回操作记录"""
+        if len(ops) <= 1 or max_concurrency <= 1:
+            return [self.execute_operation(*op) for op in ops]
         
-        elif command == "get_project_stats":
-            project_id = parameters.get("project_id")
-            response = requests.get(
-                f"{config['base_url']}/api/projects/{project_id}/stats",
-                auth=(config['api_key'], config['secret_key']),
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
+        # HTTP 调用受 I/O 限制，线程等待响应时释放 GIL；Session 连接池可在线程间共享
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(ops))) as executor:
+            return list(executor.map(lambda op: self.execute_operation(*op), ops))
+    
+    async def aexecute_operation(
+        self,
+        tool_name: str,
+        operation_type: OperationType,
+        command: str,
+        parameters: Dict[str, Any],
+        **kwargs
+    ) -> OperationRecord:
+        """execute_operation 的异步版本（在线程中执行，不阻塞事件循环）"""
+        return await asyncio.to_thread(
+            self.execute_operation, tool_name, operation_type, command, parameters, **kwargs
+        )
+    
+    async def aexecute_operations(
+        self,
+        ops: List[Tuple[str, OperationType, str, Dict[str, Any]]],
+        max_concurrency: int = 10
+    ) -> List[OperationRecord]:
+        """execute_operations 的异步版本：同时进行的操作不超过 max_concurrency 个，按传入顺序返回"""
+        sem = asyncio.Semaphore(max_concurrency)
         
-        elif command == "get_traces":
-            project_id = parameters.get("project_id")
-            limit = parameters.get("limit", 10)
-            response = requests.get(
-                f"{config['base_url']}/api/projects/{project_id}/traces",
-                params={"limit": limit},
-                auth=(config['api_key'], config['secret_key']),
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
+        async def one(op: Tuple[str, OperationType, str, Dict[str, Any]]) -> OperationRecord:
+            async with sem:
+                return await self.aexecute_operation(*op)
         
-        else:
-            raise ValueError(f"Unknown Langfuse command: {command}")
+        return list(await asyncio.gather(*(one(op) for op in ops)))
     
-    def _execute_github_operation(self, command: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
-        """执行 GitHub 操作"""
-        config = self.tool_configs["github"]
-        headers = {"Authorization": f"token {config['token']}"}
-        
-        if command == "get_repos":
-            response = requests.get(
-                f"{config['base_url']}/user/repos",
-                headers=headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
+    def _execute_route(
+        self,
+        tool_name: str,
+        command: str,
+        parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """按路由表执行 HTTP 操作：路径参数填入 URL 模板，查询参数取默认值后用 parameters 覆盖"""
+        label, routes = _TOOL_ROUTES[tool_name]
+        route = routes.get(command)
+        if route is None:
+            raise ValueError(f"Unknown {label} command: {command}")
         
-        elif command == "get_repo":
-            owner = parameters.get("owner")
-            repo = parameters.get("repo")
-            response = requests.get(
-                f"{config['base_url']}/repos/{owner}/{repo}",
-                headers=headers,
-                timeout=10
-            )
-            response.raise_for_status()
-            return response.json()
+        path, path_params, query_defaults = route
+        if path_params:
+            path = path.format_map({name: parameters.get(name) for name in path_params})
+        params = {name: parameters.get(name, default) for name, default in query_defaults.items()}
         
-        else:
-            raise ValueError(f"Unknown GitHub command: {command}")
+        response = self._sessions[tool_name].get(
+            self.tool_configs[tool_name]["base_url"] + path,
+            params=params or None,
+            timeout=10
+        )
+        response.raise_for_status()
+        return response.json()
     
     def get_operation_history(
         self,
@@ -320,15 +879,8 @@ class ToolOperationsSpecialist:
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """获取操作历史"""
-        operations = self.logger.operations
-        
-        if tool_name:
-            operations = [op for op in operations if op.tool_name == tool_name]
-        
-        if status:
-            operations = [op for op in operations if op.status == status]
-        
-        return [op.to_dict() for op in operations[-limit:]]
+        operations = self.logger.get_recent_operations(tool_name, status, limit)
+        return [op.to_dict() for op in operations]
     
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""